@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+
+CACHED_COMPETITIONS = 4  # Score frames kept in memory at once
+
+# A competition's whole score log, one row per score, with the team each score counts for
+# (a player's score counts for the player's team). Loaded once per competition into a frame.
+SCORE_LOG_QUERY = """
+    SELECT score_facts.id, score_facts.game_id, games.name, games.date_played,
+           COALESCE(score_facts.team_id, players.team_id), teams.name,
+           score_facts.player_id, players.name, score_facts.points
+    FROM score_facts
+    LEFT JOIN players ON score_facts.player_id = players.id
+    JOIN games ON score_facts.game_id = games.id
+    LEFT JOIN teams ON teams.id = COALESCE(score_facts.team_id, players.team_id)
+    WHERE score_facts.comp_id = %s
+"""
+FRAME_COLUMNS = ["score_id", "game_id", "game", "date_played", "team_id", "team", "player_id", "player", "points"]
+
+def require_pandas():
+    try:
+        import pandas as pd
+    except ImportError:
+        raise RuntimeError("Score analytics require the pandas package (pip install pandas).")
+    return pd
+
+def load_frame(cursor, competition_id):
+    """A competition's score log as a pandas DataFrame with FRAME_COLUMNS, one row per score."""
+    pd = require_pandas()
+    cursor.execute(SCORE_LOG_QUERY, (competition_id,))
+    frame = pd.DataFrame.from_records(cursor.fetchall(), columns=FRAME_COLUMNS)
+    frame["points"] = frame["points"].astype("float64")  # Decimal objects -> one float64 array
+    frame["date_played"] = pd.to_datetime(frame["date_played"])
+    for column in ("team_id", "player_id"):
+        frame[column] = frame[column].astype("Int64")  # Nullable, so team scores keep player_id <NA>
+    for column in ("game", "team", "player"):
+        frame[column] = frame[column].astype("category")  # Names repeat on every score
+    return frame
+
+def rankings(frame):
+    """Teams by total points: rank, team, points, scores and games scored in."""
+    scored = frame.dropna(subset=["team_id"])
+    totals = scored.groupby(["team_id", "team"], observed=True).agg(
+        points=("points", "sum"), scores=("score_id", "size"), games=("game_id", "nunique")
+    ).reset_index()
+    totals["rank"] = totals["points"].rank(method="min", ascending=False).astype("int64")
+    return totals.sort_values(["rank", "team"])[["rank", "team", "points", "scores", "games"]]
+
+def cumulative_points(frame):
+    """Running point totals per team over games.date_played: one row per date, one column per team."""
+    dated = frame.dropna(subset=["team_id", "date_played"])
+    per_day = dated.pivot_table(index="date_played", columns="team", values="points",
+                                aggfunc="sum", fill_value=0, observed=True)
+    return per_day.sort_index().cumsum()
+
+def player_contributions(frame):
+    """Each player's points and their share of their team's total (team scores included in the total)."""
+    scored = frame.dropna(subset=["team_id"])
+    team_totals = scored.groupby("team_id")["points"].sum()
+    players = scored.dropna(subset=["player_id"]).groupby(["team_id", "team", "player"], observed=True)["points"].sum()
+    result = players.reset_index()
+    result["share"] = result["points"] / result["team_id"].map(team_totals).where(lambda total: total != 0)
+    return result.sort_values(["team", "points"], ascending=[True, False])[["team", "player", "points", "share"]]
+
+def head_to_head(frame, team_a, team_b):
+    """Compare two team ids game by game over the games both scored in.
+
+    Returns (summary dict with wins/losses/draws for team_a and the point
+    difference, frame of game, points_a, points_b and difference per game).
+    """
+    if team_a == team_b:
+        raise ValueError("Pick two different teams.")
+    per_game = frame[frame["team_id"].isin([team_a, team_b])].pivot_table(
+        index=["game_id", "game"], columns="team_id", values="points", aggfunc="sum", observed=True
+    )
+    both = per_game.reindex(columns=[team_a, team_b]).dropna()  # A team with no scores leaves no games
+    difference = both[team_a] - both[team_b]
+    summary = {
+        "games": len(both),
+        "wins": int((difference > 0).sum()),
+        "losses": int((difference < 0).sum()),
+        "draws": int((difference == 0).sum()),
+        "point_difference": float(difference.sum()),
+    }
+    per_game = both.assign(difference=difference).reset_index(level="game_id", drop=True).reset_index()
+    per_game.columns = ["game", "points_a", "points_b", "difference"]
+    return summary, per_game
+
+def scored_teams(frame):
+    """(team id, name) pairs of the teams with scores in the frame, by name."""
+    teams = frame.dropna(subset=["team_id"]).drop_duplicates("team_id").sort_values("team")
+    return list(zip(teams["team_id"].astype(int), teams["team"].astype(str)))
+
+def display_rows(result):
+    """(column headings, rows of display text) for a result frame; a named index becomes the first column."""
+    pd = require_pandas()
+    if result.index.name is not None:
+        result = result.reset_index()
+
+    def text(value):
+        if pd.isna(value):
+            return ""
+        if isinstance(value, pd.Timestamp):
+            return value.date().isoformat()
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+    return [str(column) for column in result.columns], [
+        tuple(map(text, row)) for row in result.itertuples(index=False, name=None)
+    ]
+
+class AnalyticsCache:
+    """Score frames per competition, so each chart or table is computed without another query.
+
+    load(competition_id) returns the frame (see load_frame). Frames are kept for
+    the CACHED_COMPETITIONS most recently used competitions and dropped with
+    invalidate() when scores are added or deleted.
+    """
+    def __init__(self, load, size=CACHED_COMPETITIONS):
+        self.load = load
+        self.size = size
+        self._frames = OrderedDict()  # competition id -> frame
+        self._generation = 0  # Bumped by invalidate(), so a load that raced it is not kept
+        self._lock = threading.Lock()
+
+    def frame(self, competition_id):
+        with self._lock:
+            if competition_id in self._frames:
+                self._frames.move_to_end(competition_id)
+                return self._frames[competition_id]
+            generation = self._generation
+        frame = self.load(competition_id)
+        with self._lock:
+            if generation != self._generation:
+                return frame  # Scores changed while loading; use it once but read afresh next time
+            self._frames[competition_id] = frame
+            while len(self._frames) > self.size:
+                self._frames.popitem(last=False)
+        return frame
+
+    def invalidate(self, competition_id=None):
+        """Drop one competition's frame (or every frame) so it is reloaded on next use."""
+        with self._lock:
+            self._generation += 1
+            if competition_id is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(competition_id, None)
@@ -0,0 +1,99 @@
+import json
+import logging
+import queue
+import socket
+import threading
+import uuid
+from db_pool import DATABASE_NAME
+
+CHANGE_PORT = 50555  # UDP port every desk listens on for change events
+BROADCAST_ADDRESS = "<broadcast>"  # Reaches every desk on the local network, including this host
+MAX_EVENT_BYTES = 8192
+
+log = logging.getLogger(__name__)
+
+class ChangeFeed:
+    """Lightweight pub/sub for row changes between desks sharing one database.
+
+    After a write, the repository publishes a small JSON event
+    ({"table", "op", "ids", "comp_id"}) as a UDP broadcast. Every desk that
+    called start() receives it on a background thread and queues it; the UI
+    drains the queue with poll() and applies the delta instead of reloading.
+    Events carry a scope (server and database) so desks working against a
+    different database ignore them, and an origin so a desk skips its own.
+    Delivery is best effort: a lost datagram only means a tab stays stale until
+    its next load.
+    """
+    def __init__(self, credentials, port=CHANGE_PORT, address=BROADCAST_ADDRESS):
+        self.port = port
+        self.address = address
+        self.origin = uuid.uuid4().hex
+        self.scope = f"{credentials['host']}:{credentials['port']}/{credentials.get('database', DATABASE_NAME)}"
+        self.events = queue.Queue()
+        self._sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sender.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self._listener = None
+        self.published = 0
+        self.received = 0
+
+    def publish(self, table, op, ids=(), comp_id=None):
+        """Tell the other desks that rows were inserted into or deleted from a table."""
+        event = {
+            "scope": self.scope, "origin": self.origin,
+            "table": table, "op": op, "ids": [int(row_id) for row_id in ids], "comp_id": comp_id,
+        }
+        payload = json.dumps(event).encode("utf-8")
+        if len(payload) > MAX_EVENT_BYTES:
+            event["ids"] = []  # Too many to list; receivers fall back to a high-water-mark sync
+            payload = json.dumps(event).encode("utf-8")
+        try:
+            self._sender.sendto(payload, (self.address, self.port))
+            self.published += 1
+        except OSError as e:
+            log.warning("Could not publish %s %s change: %s", table, op, e)
+
+    def start(self):
+        """Listen for other desks' events on a daemon thread; returns False if the port is unavailable."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Several desks on one host
+        if hasattr(socket, "SO_REUSEPORT"):
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            listener.bind(("", self.port))
+        except OSError as e:
+            log.warning("Live updates disabled, cannot listen on UDP %d: %s", self.port, e)
+            listener.close()
+            return False
+        self._listener = listener
+        threading.Thread(target=self._listen, name="change-feed", daemon=True).start()
+        return True
+
+    def _listen(self):
+        listener = self._listener
+        while True:
+            try:
+                payload, _ = listener.recvfrom(MAX_EVENT_BYTES)
+            except OSError:
+                return  # Socket closed by stop()
+            try:
+                event = json.loads(payload.decode("utf-8"))
+            except ValueError:
+                continue
+            if event.get("scope") == self.scope and event.get("origin") != self.origin:
+                self.received += 1
+                self.events.put(event)
+
+    def poll(self):
+        """Return every event received since the last call (call from the UI thread)."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def stop(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        self._sender.close()
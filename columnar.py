@@ -0,0 +1,49 @@
+from array import array
+
+FETCH_BATCH = 5000  # Rows pulled from the cursor at a time while building the columns
+
+def text(value):
+    """Display text for a raw (text protocol) value; NULL stays None."""
+    return value.decode("utf-8") if value is not None else None
+
+class ColumnarRows:
+    """A result kept as columns instead of one tuple per row.
+
+    Ids go into a compact integer array; every other column keeps the bytes the
+    server sent over the text protocol (from a raw cursor), so no datetime,
+    Decimal or int objects are built. A value is decoded to text only when its
+    row is displayed.
+    """
+    def __init__(self, column_count):
+        self.ids = array("q")
+        self.columns = [[] for _ in range(column_count - 1)]
+
+    @classmethod
+    def fetch(cls, cursor, batch_size=FETCH_BATCH):
+        """Read every row of an executed raw cursor whose first column is an integer id."""
+        result = cls(len(cursor.description))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return result
+            result.extend(rows)
+
+    def extend(self, rows):
+        columns = list(zip(*rows))  # Transpose the batch in C rather than per value in Python
+        self.ids.extend(map(int, columns[0]))
+        for column, values in zip(self.columns, columns[1:]):
+            column.extend(values)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def values(self, index, formats=None):
+        """Display values of one row, id first; formats maps a column number (id = 0) to a decoder."""
+        formats = formats or {}
+        return (str(self.ids[index]),) + tuple(
+            formats.get(number, text)(column[index]) for number, column in enumerate(self.columns, 1)
+        )
+
+    def high_water(self):
+        """Largest id in the result, or None if it is empty."""
+        return max(self.ids) if self.ids else None
@@ -0,0 +1,94 @@
+import threading
+import time
+
+FULL_REFRESH_AFTER = 300  # Seconds before a competition's totals are recomputed from scratch
+
+# Everything the overview shows for one competition, in one round trip: the entity counts on every
+# row, plus one row per game with the scores logged after the given score id (none if there are none).
+FIGURES_QUERY = """
+    SELECT counts.teams, counts.players, counts.games,
+           per_game.game_id, games.name, per_game.scores, per_game.points, per_game.last_id
+    FROM (
+        SELECT (SELECT COUNT(*) FROM teams WHERE comp_id = %s) AS teams,
+               (SELECT COUNT(*) FROM players JOIN teams ON players.team_id = teams.id
+                WHERE teams.comp_id = %s) AS players,
+               (SELECT COUNT(*) FROM games WHERE comp_id = %s) AS games
+    ) AS counts
+    LEFT JOIN (
+        SELECT game_id, COUNT(*) AS scores, SUM(points) AS points, MAX(id) AS last_id
+        FROM score_facts
+        WHERE comp_id = %s AND id > %s
+        GROUP BY game_id
+    ) AS per_game ON TRUE
+    LEFT JOIN games ON games.id = per_game.game_id
+"""
+
+def fetch_figures(cursor, competition_id, since_id=0):
+    """Rows of FIGURES_QUERY for a competition, counting only scores with ids above since_id."""
+    cursor.execute(FIGURES_QUERY, (competition_id, competition_id, competition_id, competition_id, since_id))
+    return cursor.fetchall()
+
+class CompetitionFigures:
+    """Running dashboard totals for one competition."""
+    def __init__(self):
+        self.teams = self.players = self.games = 0
+        self.per_game = {}  # game id -> [name, scores, points]
+        self.last_score_id = 0
+        self.loaded_at = time.monotonic()
+
+    def merge(self, rows):
+        """Take the counts from FIGURES_QUERY rows and add their score aggregates to the totals."""
+        for teams, players, games, game_id, name, scores, points, last_id in rows:
+            self.teams, self.players, self.games = teams, players, games
+            if game_id is not None:
+                entry = self.per_game.setdefault(game_id, [name, 0, 0])
+                entry[1] += scores
+                entry[2] += points
+                self.last_score_id = max(self.last_score_id, last_id)
+
+    def summary(self):
+        played = len(self.per_game)
+        points = sum(entry[2] for entry in self.per_game.values())
+        return {
+            "teams": self.teams,
+            "players": self.players,
+            "games": self.games,
+            "games_played": played,
+            "scores": sum(entry[1] for entry in self.per_game.values()),
+            "points": points,
+            "points_per_game": points / played if played else 0,
+        }
+
+class DashboardCache:
+    """Per-competition overview figures, refreshed incrementally.
+
+    The first get() for a competition aggregates all its scores; later calls
+    only aggregate scores with ids past the last one seen, and the entity
+    counts are re-read each time (they are index-only counts). Deleted scores
+    cannot be subtracted that way, so deletes call invalidate(), and entries
+    are rebuilt after FULL_REFRESH_AFTER in case a slow transaction committed
+    a lower id late. load(competition_id, since_id) runs FIGURES_QUERY.
+    """
+    def __init__(self, load, max_age=FULL_REFRESH_AFTER):
+        self.load = load
+        self.max_age = max_age
+        self._entries = {}  # competition id -> CompetitionFigures
+        self._lock = threading.Lock()
+
+    def get(self, competition_id):
+        """Bring a competition's figures up to date and return their summary dict."""
+        with self._lock:  # One refresh at a time, so no two add the same new scores
+            entry = self._entries.get(competition_id)
+            if entry is None or time.monotonic() - entry.loaded_at > self.max_age:
+                entry = CompetitionFigures()
+            entry.merge(self.load(competition_id, entry.last_score_id))
+            self._entries[competition_id] = entry
+            return entry.summary()
+
+    def invalidate(self, competition_id=None):
+        """Forget one competition's figures (or all of them) so the next get() recomputes them."""
+        with self._lock:
+            if competition_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(competition_id, None)
@@ -0,0 +1,250 @@
+import threading
+import time
+from collections import OrderedDict
+import mysql.connector
+
+DATABASE_NAME = "compDB"
+POOL_SIZE = 5  # Idle connections kept open per set of credentials
+POOL_MAX_IDLE = 300  # Seconds an idle connection may sit before it is reaped
+POOL_PING_AFTER = 5  # Skip the health-check ping for connections used this recently
+STATEMENTS_PER_CONNECTION = 32  # Prepared statements kept open on each pooled connection
+# Seconds before a dropped network is reported as an error instead of hanging until TCP gives up
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 60  # Long enough for the largest report query
+WRITE_TIMEOUT = 30
+
+class PreparedStatement:
+    """A pooled prepared cursor bound to the SQL string it was prepared from.
+
+    mysql-connector only skips re-preparing when execute() gets the very string
+    object it ran last time (an identity check), so SQL rebuilt per call, e.g.
+    with an f-string, would be prepared again on every execution. Equal SQL is
+    therefore always executed with the one stored string.
+    """
+    def __init__(self, cursor, sql):
+        self._cursor = cursor
+        self.sql = sql
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _statement(self, sql):
+        if sql != self.sql:
+            raise ValueError("A prepared statement can only execute the SQL it was prepared from.")
+        return self.sql
+
+    def execute(self, sql, params=()):
+        return self._cursor.execute(self._statement(sql), params)
+
+    def executemany(self, sql, seq_params):
+        return self._cursor.executemany(self._statement(sql), seq_params)
+
+class StatementCache:
+    """Server-side prepared statements kept open on one connection, keyed by SQL text.
+
+    Each statement is a prepared cursor: the server parses the SQL once, and later
+    executions only send the parameters (binary protocol). The least recently
+    used statement is closed when the cache is full. A reconnect drops every
+    statement on the server, so the cache starts over when the session changes.
+    """
+    def __init__(self, size=STATEMENTS_PER_CONNECTION):
+        self.size = size
+        self.session = None
+        self._cursors = OrderedDict()
+
+    def cursor(self, conn, sql):
+        """Return (PreparedStatement for sql, whether it was already prepared)."""
+        if conn.connection_id != self.session:
+            self._cursors.clear()  # Statements of the old session are gone; nothing to close
+            self.session = conn.connection_id
+        statement = self._cursors.pop(sql, None)
+        reused = statement is not None
+        if statement is None:
+            statement = PreparedStatement(conn.cursor(prepared=True), sql)
+            if len(self._cursors) >= self.size:
+                self.close_cursor(self._cursors.popitem(last=False)[1])
+        self._cursors[sql] = statement
+        return statement, reused
+
+    @staticmethod
+    def close_cursor(cursor):
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+
+class PooledConnection:
+    """Wrapper around a MySQL connection that returns it to its pool on close()."""
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def prepared(self, sql):
+        """A server-side prepared statement for sql, prepared on this connection once and then reused.
+
+        Execute it with equal sql (it need not be the same string object); the
+        statement belongs to the pool, so do not close it.
+        """
+        return self._pool.prepared_cursor(self._conn, sql)
+
+    def close(self):
+        """Hand the connection back to the pool instead of closing the socket."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+class ConnectionPool:
+    """Keeps authenticated MySQL connections open so handlers can reuse them."""
+    def __init__(self, credentials, size=POOL_SIZE, max_idle=POOL_MAX_IDLE,
+                 ping_after=POOL_PING_AFTER, database=DATABASE_NAME):
+        self.credentials = credentials
+        self.size = size
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.database = database
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._statements = {}  # connection -> StatementCache
+        self._lock = threading.Lock()
+        self.counters = {
+            "checkouts": 0,
+            "handshakes": 0,
+            "handshakes_avoided": 0,
+            "reconnects": 0,
+            "reaped": 0,
+            "statements_prepared": 0,
+            "statements_reused": 0,
+        }
+
+    def _open(self):
+        """Open a brand new connection (a full TCP + auth handshake)."""
+        conn = mysql.connector.connect(
+            host=self.credentials["host"],
+            port=self.credentials["port"],
+            user=self.credentials["user"],
+            password=self.credentials["password"],
+            database=self.database,
+            connection_timeout=CONNECT_TIMEOUT,
+            read_timeout=READ_TIMEOUT,
+            write_timeout=WRITE_TIMEOUT
+        )
+        with self._lock:
+            self.counters["handshakes"] += 1
+        return conn
+
+    def prepared_cursor(self, conn, sql):
+        with self._lock:
+            cache = self._statements.setdefault(conn, StatementCache())
+        cursor, reused = cache.cursor(conn, sql)  # Only the thread holding conn touches its cache
+        with self._lock:
+            self.counters["statements_reused" if reused else "statements_prepared"] += 1
+        return cursor
+
+    def _discard(self, conn):
+        self._statements.pop(conn, None)  # May run under self._lock (reaping); a single dict pop is atomic
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def _is_healthy(self, conn, last_used):
+        """Ping connections that have been idle long enough to have gone stale."""
+        if time.monotonic() - last_used < self.ping_after:
+            return True
+        try:
+            return conn.is_connected()
+        except mysql.connector.Error:
+            return False
+
+    def get_connection(self):
+        """Check out a connection, reusing an idle one when it is still alive."""
+        with self._lock:
+            self.counters["checkouts"] += 1
+            self._reap_locked()
+            conn, last_used = self._idle.pop() if self._idle else (None, None)
+
+        if conn is None:
+            return PooledConnection(self, self._open())
+
+        if not self._is_healthy(conn, last_used):
+            # The server or network dropped the session; reconnect in place
+            try:
+                conn.reconnect(attempts=1)
+            except mysql.connector.Error:
+                self._discard(conn)
+                return PooledConnection(self, self._open())
+            with self._lock:
+                self.counters["handshakes"] += 1
+                self.counters["reconnects"] += 1
+            return PooledConnection(self, conn)
+
+        with self._lock:
+            self.counters["handshakes_avoided"] += 1
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a connection to the idle list, or close it if the pool is full."""
+        try:
+            # Never let an unfinished transaction (or a stale read snapshot) leak to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._reap_locked()
+            if len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._discard(conn)
+
+    def _reap_locked(self):
+        """Close idle connections that have not been used within max_idle seconds."""
+        cutoff = time.monotonic() - self.max_idle
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.pop(0)
+            self._discard(conn)
+            self.counters["reaped"] += 1
+
+    def reap_idle(self):
+        """Close expired idle connections; safe to call periodically."""
+        with self._lock:
+            self._reap_locked()
+
+    def close_all(self):
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Return a snapshot of the pool counters and current idle count."""
+        with self._lock:
+            return dict(self.counters, idle=len(self._idle), size=self.size)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(credentials, **options):
+    """Return the shared pool for these credentials, creating it on first use.
+
+    credentials may name a "database" other than DATABASE_NAME (e.g. a benchmark schema).
+    """
+    options.setdefault("database", credentials.get("database", DATABASE_NAME))
+    key = (credentials["host"], credentials["port"], credentials["user"], credentials["password"], options["database"])
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(credentials, **options)
+        return pool
+
+def close_all_pools():
+    """Close the idle connections of every pool (e.g. on application exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
@@ -0,0 +1,180 @@
+import json
+import logging
+import logging.handlers
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+SLOW_QUERY_MS = 250  # Records whose total time exceeds this are flagged as slow
+HISTORY_SIZE = 1000  # Records kept in memory for the diagnostics panel
+QUERY_LOG_PATH = "query_log.jsonl"
+QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+QUERY_LOG_BACKUPS = 3
+
+log = logging.getLogger(__name__)
+query_log = logging.getLogger("compdb.queries")  # One JSON object per line, see enable_log()
+query_log.propagate = False
+
+def fingerprint(sql):
+    """Normalize a statement so runs with different parameters group together."""
+    text = re.sub(r"'(?:[^'\\]|\\.|'')*'", "?", sql)
+    text = re.sub(r"\b\d+(?:\.\d+)?\b", "?", text)
+    text = text.replace("%s", "?")
+    text = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(...)", text)
+    return " ".join(text.split())
+
+class QueryProfiler:
+    """Collects timing records for database statements and Treeview updates.
+
+    Query records carry the statement fingerprint, time spent in execute() (db_ms),
+    time spent fetching (fetch_ms) and the row count; UI records carry the time
+    spent inserting rows into a widget (ui_ms). Safe to use from worker threads.
+    """
+    def __init__(self, history=HISTORY_SIZE, slow_ms=SLOW_QUERY_MS):
+        self.slow_ms = slow_ms
+        self.history_size = history
+        self._records = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def enable_log(self, path=QUERY_LOG_PATH, max_bytes=QUERY_LOG_MAX_BYTES, backups=QUERY_LOG_BACKUPS):
+        """Also append every record to a size-rotated JSON Lines file."""
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        query_log.addHandler(handler)
+        query_log.setLevel(logging.INFO)
+
+    def _add(self, record):
+        record["total_ms"] = round(record.get("db_ms", 0) + record.get("fetch_ms", 0) + record.get("ui_ms", 0), 2)
+        record["slow"] = record["total_ms"] > self.slow_ms
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._records.append(record)
+        if record["slow"]:
+            log.warning("Slow %s %s: %.1f ms, %d rows", record["kind"], record["label"], record["total_ms"], record["rows"])
+        if query_log.handlers:
+            query_log.info(json.dumps(record, default=str))
+
+    def record_query(self, label, sql, db_ms, fetch_ms, rows, error=None):
+        record = {
+            "at": time.time(), "kind": "query", "label": label, "fingerprint": fingerprint(sql),
+            "db_ms": round(db_ms, 2), "fetch_ms": round(fetch_ms, 2), "rows": rows,
+        }
+        if error is not None:
+            record["error"] = str(error)
+        self._add(record)
+
+    @contextmanager
+    def ui_timer(self, label, rows):
+        """Time a block that populates a widget with `rows` rows."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add({
+                "at": time.time(), "kind": "ui", "label": label, "fingerprint": "",
+                "ui_ms": round((time.perf_counter() - started) * 1000, 2), "rows": rows,
+            })
+
+    def records_since(self, seq):
+        """Records newer than seq, oldest first."""
+        with self._lock:
+            return [record for record in self._records if record["seq"] > seq]
+
+    def summary(self):
+        """Per-fingerprint (label, fingerprint, count, avg ms, max ms, rows) over the kept history, slowest first."""
+        groups = {}
+        for record in self.records_since(0):
+            if record["kind"] == "ui":
+                key, text = ("ui", record["label"]), "(Treeview update)"
+            else:
+                key, text = ("query", record["fingerprint"]), record["fingerprint"]
+            group = groups.setdefault(key, [record["label"], text, 0, 0.0, 0.0, 0])
+            group[2] += 1
+            group[3] += record["total_ms"]
+            group[4] = max(group[4], record["total_ms"])
+            group[5] += record["rows"]
+        rows = [(label, text, count, total / count, worst, total_rows)
+                for label, text, count, total, worst, total_rows in groups.values()]
+        return sorted(rows, key=lambda row: row[3] * row[2], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+class ProfiledCursor:
+    """Cursor wrapper that times execute() and the fetches that follow it.
+
+    A statement's record is written when the next statement starts or the
+    cursor is closed, so its fetch time and row count are complete.
+    """
+    def __init__(self, cursor, profiler, label):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._label = label
+        self._pending = None  # [sql, db_ms, fetch_ms, rows]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _run(self, method, sql, params):
+        self.finish()
+        started = time.perf_counter()
+        try:
+            method(sql, params)
+        except Exception as e:
+            self._profiler.record_query(self._label, sql, (time.perf_counter() - started) * 1000, 0, 0, error=e)
+            raise
+        # Rows of a SELECT are counted as they are fetched; writes report what they affected
+        rows = 0 if self._cursor.with_rows else max(self._cursor.rowcount, 0)
+        self._pending = [sql, (time.perf_counter() - started) * 1000, 0.0, rows]
+
+    def execute(self, sql, params=()):
+        self._run(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_params):
+        self._run(self._cursor.executemany, sql, seq_params)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._pending is not None:
+            self._pending[2] += (time.perf_counter() - started) * 1000
+            if isinstance(result, list):
+                self._pending[3] += len(result)
+            elif result is not None:
+                self._pending[3] += 1
+        return result
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=1):
+        return self._fetch(self._cursor.fetchmany, size)
+
+    def finish(self):
+        """Write the record for the statement in progress, if any."""
+        if self._pending is not None:
+            sql, db_ms, fetch_ms, rows = self._pending
+            self._pending = None
+            self._profiler.record_query(self._label, sql, db_ms, fetch_ms, rows)
+
+    def close(self):
+        self.finish()
+        self._cursor.close()
+
+_profiler = QueryProfiler()
+
+def get_profiler():
+    """Return the process-wide profiler."""
+    return _profiler
+
+def profiled(cursor, label):
+    """Wrap a cursor so its statements are recorded under label."""
+    return ProfiledCursor(cursor, _profiler, label)
@@ -0,0 +1,70 @@
+import csv
+from db_pool import get_pool
+from diagnostics import profiled
+
+FETCH_SIZE = 5000  # Rows pulled from the server per fetchmany() call
+
+def stream_rows(credentials, sql, params=(), fetch_size=FETCH_SIZE):
+    """Yield lists of rows from an unbuffered cursor so the result set is never held in memory."""
+    conn = get_pool(credentials).get_connection()
+    try:
+        cursor = profiled(conn.cursor(buffered=False), "export")
+        cursor.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if conn.unread_result:
+                conn.consume_results()  # Drain rows we stopped reading so the connection can be reused
+            cursor.close()
+    finally:
+        conn.close()
+
+def write_csv(chunks, headers, path):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+def write_parquet(chunks, headers, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires the pyarrow package (pip install pyarrow).")
+
+    count = 0
+    writer = None
+    try:
+        for rows in chunks:
+            columns = {name: [row[i] for row in rows] for i, name in enumerate(headers)}
+            if writer is None:
+                # Infer the schema from the first chunk; all-NULL columns fall back to strings
+                table = pa.Table.from_pydict(columns)
+                schema = pa.schema([
+                    pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pydict(columns, schema=writer.schema))
+            count += len(rows)
+        if writer is None:
+            writer = pq.ParquetWriter(path, pa.schema([pa.field(name, pa.string()) for name in headers]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def export_query(credentials, sql, params, headers, path):
+    """Stream a query's result to a .csv or .parquet file and return the number of rows written."""
+    chunks = stream_rows(credentials, sql, params)
+    if path.lower().endswith(".parquet"):
+        return write_parquet(chunks, headers, path)
+    return write_csv(chunks, headers, path)
@@ -1,6 +1,48 @@
+import logging
+import sqlite3
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import mysql.connector
+from db_pool import POOL_SIZE, get_pool, close_all_pools
+from query_executor import QueryExecutor
+from paged_table import PagedTreeview
+from ref_cache import REFERENCE_QUERIES, get_reference_cache
+from importer import IMPORT_KINDS, import_file
+from repository import CompetitionRepository
+from diagnostics import SLOW_QUERY_MS, get_profiler
+from change_feed import ChangeFeed
+from write_queue import WriteQueue, is_connection_error, new_key, replay
+from snapshot import LocalSnapshot
+from picker import PICKER_LIMIT, TypeaheadPicker
+from dashboard import DashboardCache
+from analytics import (
+    AnalyticsCache, cumulative_points, display_rows, head_to_head, player_contributions, rankings, scored_teams
+)
+
+POOL_REAP_INTERVAL_MS = 60000  # How often idle pooled connections are checked for expiry
+DIAGNOSTICS_REFRESH_MS = 1000  # How often an open diagnostics window picks up new records
+CHANGE_POLL_MS = 250  # How often changes received from other desks are applied (no database access)
+REPLAY_INTERVAL_MS = 15000  # How often writes queued while offline are retried
+# Display decoders for raw column values, by tab and Treeview column number (see columnar.py)
+TAB_FORMATS = {
+    "games": {3: lambda value: "Yes" if value == b"1" else "No"},  # team_game flag
+}
+SEARCH_DEBOUNCE_MS = 300  # Pause in typing before a search box queries the database
+# Analytics tab views that take only the score frame (see analytics.py); head to head also needs two teams
+ANALYTICS_VIEWS = {
+    "Rankings": rankings,
+    "Cumulative points": cumulative_points,
+    "Player contributions": player_contributions,
+}
+HEAD_TO_HEAD = "Head to head"
+ANALYTICS_HEADINGS = {
+    "rank": "Rank", "team": "Team", "player": "Player", "points": "Points", "scores": "Scores",
+    "games": "Games", "share": "Share of team", "date_played": "Date", "game": "Game",
+    "points_a": "Team A", "points_b": "Team B", "difference": "Difference",
+}
+
+log = logging.getLogger(__name__)
 
 class LoginDialog(simpledialog.Dialog):
     """Dialog for user login to the database."""
@@ -55,29 +97,28 @@ class LoginDialog(simpledialog.Dialog):
             messagebox.showerror("Login Error", f"Failed to connect to the database: {e}")
             return False
 
-def connect_db(credentials):
-    """Establish a connection to the database using the provided credentials."""
-    try:
-        return mysql.connector.connect(
-            host=credentials["host"],
-            port=credentials["port"],
-            user=credentials["user"],
-            password=credentials["password"],
-            database="compDB"
-        )
-    except mysql.connector.Error as e:
-        messagebox.showerror("Database Connection Error", str(e))
-        return None
-
 class CompetitionDBApp(tk.Tk):
     """Main application for managing competition data."""
     def __init__(self, db_credentials):
         super().__init__()
         self.db_credentials = db_credentials
+        # All SQL lives in repository.py; committed writes are broadcast to the other desks
+        self.change_feed = ChangeFeed(db_credentials)
+        self.repo = CompetitionRepository(db_credentials, feed=self.change_feed)
         self.selected_competition_id = None  # Track the selected competition
         self.title("Competition DB Manager")
         self.geometry("1000x600")  # Set window size
 
+        # Status bar with the number of writes queued while the database was unreachable
+        self.write_queue = WriteQueue()
+        self.replaying = False
+        status_bar = ttk.Frame(self)
+        status_bar.pack(side="bottom", fill="x")
+        self.queue_status = ttk.Label(status_bar, text="")
+        self.queue_status.pack(side="left", padx=5)
+        self.send_queued_btn = ttk.Button(status_bar, text="Send Now", command=self.send_queued_now)
+        self.send_queued_btn.pack(side="right", padx=5)
+
         # Create tabs for different sections
         self.tabs = ttk.Notebook(self)
         self.tabs.pack(expand=1, fill="both")
@@ -87,12 +128,37 @@ class CompetitionDBApp(tk.Tk):
         self.games_tab = ttk.Frame(self.tabs)
         self.players_tab = ttk.Frame(self.tabs)
         self.competitions_tab = ttk.Frame(self.tabs)
+        self.leaderboard_tab = ttk.Frame(self.tabs)
+        self.analytics_tab = ttk.Frame(self.tabs)
 
         self.tabs.add(self.team_tab, text="Teams")
         self.tabs.add(self.score_tab, text="Scores")
         self.tabs.add(self.games_tab, text="Games")
         self.tabs.add(self.players_tab, text="Players")
         self.tabs.add(self.competitions_tab, text="Competitions")
+        self.tabs.add(self.leaderboard_tab, text="Leaderboard")
+        self.tabs.add(self.analytics_tab, text="Analytics")
+        self.tabs.bind("<<NotebookTabChanged>>", lambda event: self.show_analytics_if_selected())
+
+        # Run database work off the Tk thread; each tab shows a marker while its query is in flight
+        self.tab_busy_keys = [
+            (self.team_tab, "Teams", ("teams",)),
+            (self.score_tab, "Scores", ("scores", "scores_count")),
+            (self.games_tab, "Games", ("games",)),
+            (self.players_tab, "Players", ("players",)),
+            (self.competitions_tab, "Competitions", ("competitions",)),
+            (self.leaderboard_tab, "Leaderboard", ("leaderboard",)),
+            (self.analytics_tab, "Analytics", ("analytics",)),
+        ]
+        # One worker per pooled connection so the tab queries can run side by side
+        self.executor = QueryExecutor(self, workers=POOL_SIZE, on_busy=self.update_busy_indicators)
+        self.reference_cache = get_reference_cache(db_credentials)  # Dropdown lookups
+        self.profiler = get_profiler()  # Query and Treeview timings, see show_diagnostics()
+        self.dashboard = DashboardCache(self.repo.dashboard)  # Overview figures per competition
+        self.score_analytics = AnalyticsCache(self.repo.score_frame)  # Score log frames, see analytics.py
+        # Search text and (column index, descending) sort per tab, applied by MySQL; see add_view_controls()
+        self.tab_views = {}
+        self.search_timers = {}
 
         # Initialize UI components
         self.init_competition_selector()
@@ -101,8 +167,424 @@ class CompetitionDBApp(tk.Tk):
         self.init_games_tab()
         self.init_players_tab()
         self.init_competitions_tab()
+        self.init_leaderboard_tab()
+        self.init_analytics_tab()
+
+        # Treeviews whose rows are keyed by database id, and the highest id loaded into each
+        self.tab_tables = {
+            "teams": self.team_table,
+            "games": self.games_table,
+            "players": self.players_table,
+            "competitions": self.competitions_table,
+        }
+        self.high_water = {}
+
+        # Show what was on screen at the last exit at once, then bring it up to date in the background
+        self.snapshot = LocalSnapshot(db_credentials)
+        if not self.restore_snapshot():
+            self.clear_competition_filter()  # First start: load all data
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(POOL_REAP_INTERVAL_MS, self.reap_idle_connections)
+        if self.change_feed.start():
+            self.after(CHANGE_POLL_MS, self.apply_remote_changes)
+        self.update_queue_status()
+        self.replay_periodically()  # Sends anything left over from a previous session
+
+    def reap_idle_connections(self):
+        """Periodically close pooled connections that have sat idle too long."""
+        get_pool(self.db_credentials).reap_idle()
+        self.after(POOL_REAP_INTERVAL_MS, self.reap_idle_connections)
+
+    def on_close(self):
+        """Release pooled connections before the window is destroyed."""
+        self.save_snapshot()
+        self.snapshot.close()
+        self.executor.shutdown()
+        self.change_feed.stop()
+        pending, _ = self.write_queue.counts()
+        if pending:
+            log.info("%d queued writes will be sent on the next start", pending)
+        self.write_queue.close()
+        stats = get_pool(self.db_credentials).stats()
+        log.info("Connection pool: %d handshakes, %d avoided", stats["handshakes"], stats["handshakes_avoided"])
+        close_all_pools()
+        self.destroy()
+
+    def apply_remote_changes(self):
+        """Apply inserts and deletes published by other desks as deltas instead of full reloads."""
+        events = self.change_feed.poll()
+        synced, reloaded = set(), set()
+        refresh_leaderboard = refresh_dashboard = False
+        scores_changed = set()  # Competitions (None = unknown) whose cached analytics are stale
+        for event in events:
+            table, op, ids = event["table"], event["op"], event["ids"]
+            if op == "delete" and not ids:
+                reloaded.add(table)  # Too many rows to list (e.g. a cascade delete)
+            elif table == "scores":
+                if op == "delete":
+                    for score_id in ids:
+                        self.score_pager.remove(score_id)
+                else:
+                    synced.add(table)
+            elif op == "delete":
+                for row_id in ids:
+                    self.remove_row(table, row_id)
+            else:
+                synced.add(table)  # Fetch past the tab's high-water mark
+            if table != "scores":
+                self.reference_cache.invalidate(*(("teams", "players") if table == "teams" else (table,)))
+            if table == "scores" and op == "delete":
+                self.dashboard.invalidate(event["comp_id"])  # Deleted points cannot be subtracted incrementally
+            if table == "scores":
+                scores_changed.add(event["comp_id"])
+            if event["comp_id"] in (None, self.selected_competition_id):
+                refresh_dashboard = True
+            if table == "competitions":
+                self.refresh_competition_list()
+            elif table != "players" and event["comp_id"] in (None, self.selected_competition_id):
+                refresh_leaderboard = True
+
+        for key in reloaded:
+            self.reload_view(key)
+        for key in synced - reloaded:
+            if key == "scores":
+                self.score_pager.refresh_tail()
+            else:
+                self.sync_tab(key)
+        if refresh_leaderboard and self.selected_competition_id is not None:
+            self.fetch_leaderboard()
+        if refresh_dashboard and self.selected_competition_id is not None:
+            self.fetch_dashboard()
+        if scores_changed:
+            self.scores_changed(*scores_changed)
+        self.after(CHANGE_POLL_MS, self.apply_remote_changes)
+
+    def update_busy_indicators(self, key, busy):
+        """Mark each tab as loading while any of its queries is still running."""
+        for tab, title, keys in self.tab_busy_keys:
+            loading = any(self.executor.is_busy(k) for k in keys)
+            self.tabs.tab(tab, text=f"{title} (loading...)" if loading else title)
+
+    def show_db_error(self, error):
+        """Report a database error raised by a background query."""
+        messagebox.showerror("Database Error", str(error))
+
+    def run_background(self, key, work, on_done=None):
+        """Run a repository call on a worker thread and pass its result to on_done on the Tk thread.
+
+        key=None marks a write, which is never cancelled by a newer submission.
+        """
+        self.executor.submit(key, work, on_done, self.show_db_error)
+
+    def queue_if_offline(self, error, kind, params, key):
+        """Queue a write that failed because the database is unreachable; returns False for any other error.
+
+        key is the idempotency key the write was attempted with, so if the
+        attempt committed before the connection dropped the replay skips it.
+        """
+        if not is_connection_error(error):
+            return False
+        self.write_queue.enqueue(kind, params, key)
+        self.update_queue_status()
+        return True
+
+    def submit_write(self, window, write, on_saved, kind=None, params=()):
+        """Run a dialog's write on a worker; close the dialog and call on_saved() once it has committed.
+
+        write(key) makes the write with an idempotency key chosen before the first
+        attempt. For a kind the offline queue handles ("team", "player", "score"),
+        a write that fails because the database is unreachable is queued under
+        that key and the dialog closes; the tabs catch up when the queue is sent.
+        Any other error is shown and the dialog stays open for corrections.
+        """
+        key = new_key()
+
+        def close():
+            if window.winfo_exists():
+                window.destroy()
+
+        def saved(_):
+            close()
+            on_saved()
+
+        def failed(error):
+            if kind is not None and self.queue_if_offline(error, kind, params, key):
+                close()
+            else:
+                self.show_db_error(error)
+
+        self.executor.submit(None, lambda: write(key), saved, failed)
+
+    def update_queue_status(self):
+        pending, refused = self.write_queue.counts()
+        text = f"Offline: {pending} change(s) waiting to be sent" if pending else "All changes saved"
+        if refused:
+            text += f" ({refused} refused by the server)"
+        self.queue_status.config(text=text)
+
+    def replay_periodically(self):
+        self.replay_queued_writes()
+        self.after(REPLAY_INTERVAL_MS, self.replay_periodically)
+
+    def send_queued_now(self):
+        """Send Now: put refused writes back in line and send everything that is waiting."""
+        self.write_queue.retry_failed()
+        self.update_queue_status()
+        self.replay_queued_writes()
+
+    def replay_queued_writes(self):
+        """Send writes queued while offline in batched transactions, in the background."""
+        if self.replaying or not self.write_queue.counts()[0]:
+            return
+        self.replaying = True
+
+        def done(result):
+            self.replaying = False
+            applied, refused = result
+            self.update_queue_status()
+            if applied.get("team"):
+                self.reference_cache.invalidate("teams")
+                self.sync_tab("teams")
+            if applied.get("player"):
+                self.reference_cache.invalidate("players")
+                self.sync_tab("players")
+            if applied.get("score"):
+                self.score_pager.refresh_tail()
+                self.fetch_leaderboard()
+                self.scores_changed()
+            if applied:
+                self.fetch_dashboard()
+            if refused:
+                details = "\n".join(f"{kind} {params}: {error}" for kind, params, error in self.write_queue.failed()[:10])
+                messagebox.showwarning("Queued Changes Refused",
+                                       f"{refused} queued change(s) were refused by the server:\n\n{details}\n\n"
+                                       "They are kept aside. Fix the cause (e.g. re-create a deleted team) "
+                                       "and press Send Now to try them again.")
+
+        def failed(error):
+            self.replaying = False
+            self.update_queue_status()
+            if not is_connection_error(error):  # Still offline is expected; try again later
+                self.show_db_error(error)
+
+        self.executor.submit(None, lambda: replay(self.write_queue, self.repo), done, failed)
+
+    def with_reference(self, table, callback, window=None):
+        """Call callback with a cached lookup table, loading it in the background on a miss.
+
+        If window is given, the callback is skipped when the window has been closed meanwhile.
+        """
+        def deliver(rows):
+            if window is None or window.winfo_exists():
+                callback(rows)
+
+        def failed(error):
+            stale = self.reference_cache.peek(table, stale_ok=True)
+            if stale is not None and is_connection_error(error):
+                deliver(stale)  # Offline: expired rows still let writes be queued
+            else:
+                self.show_db_error(error)
+
+        rows = self.reference_cache.peek(table)
+        if rows is not None:
+            deliver(rows)
+        else:
+            self.executor.submit(None, lambda: self.reference_cache.get(table), deliver, failed)
+
+    def name_matches(self, table, prefix, competition_id):
+        """Teams or players of a competition whose name starts with prefix (runs on a worker).
+
+        While the database is unreachable the last cached rows are searched instead,
+        so scores can still be entered and queued.
+        """
+        try:
+            return self.repo.name_matches(table, prefix, competition_id, PICKER_LIMIT)
+        except mysql.connector.Error as e:
+            rows = self.reference_cache.peek(table, stale_ok=True)
+            if rows is None or not is_connection_error(e):
+                raise
+        prefix = prefix.lower()
+        if table == "teams":
+            matches = [(row[0], row[1]) for row in rows if row[2] == competition_id]
+        else:
+            teams = {row[0] for row in self.reference_cache.peek("teams", stale_ok=True) or () if row[2] == competition_id}
+            matches = [row[:3] for row in rows if row[3] in teams]
+        matches = sorted((row for row in matches if row[1].lower().startswith(prefix)), key=lambda row: (row[1], row[0]))
+        return matches[:PICKER_LIMIT]
+
+    def replace_rows(self, key, rows):
+        """Replace every row of a tab's Treeview with the given columnar.ColumnarRows."""
+        table = self.tab_tables[key]
+        table.delete(*table.get_children())
+        self.high_water[key] = 0
+        self.merge_rows(key, rows)
+
+    def merge_rows(self, key, rows):
+        """Add rows not shown yet and advance the tab's high-water mark."""
+        table = self.tab_tables[key]
+        formats = TAB_FORMATS.get(key)
+        with self.profiler.ui_timer(key, len(rows)):
+            for index, row_id in enumerate(rows.ids):
+                iid = str(row_id)
+                if not table.exists(iid):
+                    table.insert("", "end", iid=iid, values=rows.values(index, formats))
+        if len(rows):
+            self.high_water[key] = max(self.high_water.get(key, 0), rows.high_water())
+
+    def remove_row(self, key, row_id):
+        """Remove a single deleted row from a tab without reloading it."""
+        table = self.tab_tables[key]
+        if table.exists(str(row_id)):
+            table.delete(str(row_id))
+
+    def sync_tab(self, key):
+        """Fetch only the rows added to a tab's table since it was last loaded (appended whatever the sort)."""
+        competition_id, since_id = self.selected_competition_id, self.high_water.get(key, 0)
+        search = self.tab_views[key]["search"]
+        self.run_background(f"{key}_delta", lambda: self.repo.tab_columns(key, competition_id, since_id, search),
+                            lambda rows: self.merge_rows(key, rows))
+
+    def load_tab(self, key):
+        """Replace a tab's rows with a fresh load for the selected competition, search and sort."""
+        competition_id = self.selected_competition_id
+        search, sort = self.tab_views[key]["search"], self.tab_views[key]["sort"]
+        self.executor.cancel(f"{key}_delta", f"{key}_ids")  # Deltas for the previous filter no longer apply
+        self.run_background(key, lambda: self.repo.tab_columns(key, competition_id, search=search, sort=sort),
+                            lambda rows: self.replace_rows(key, rows))
+
+    def add_view_controls(self, key, table, before):
+        """Add a search box above a tab's table (packed before `before`) and make its headings sortable.
+
+        Both are pushed down to MySQL: the search becomes a name match and a
+        heading click an ORDER BY, so nothing is sorted or filtered in Python.
+        """
+        bar = ttk.Frame(before.master)
+        bar.pack(fill="x", padx=5, before=before)
+        ttk.Label(bar, text="Search:").pack(side="left")
+        search_var = tk.StringVar()
+        ttk.Entry(bar, textvariable=search_var, width=30).pack(side="left", padx=5)
+        search_var.trace_add("write", lambda *_: self.schedule_search(key, search_var.get()))
+
+        columns = table["columns"]
+        for index, column in enumerate(columns):
+            table.heading(column, command=lambda index=index: self.sort_tab(key, index))
+        self.tab_views[key] = {
+            "search": "", "sort": None, "table": table,
+            "headings": [table.heading(column, "text") for column in columns],
+        }
+
+    def schedule_search(self, key, text):
+        """Run a tab's search once typing pauses, so each keystroke does not cost a query."""
+        if key in self.search_timers:
+            self.after_cancel(self.search_timers.pop(key))
+        self.search_timers[key] = self.after(SEARCH_DEBOUNCE_MS, lambda: self.apply_search(key, text.strip()))
+
+    def apply_search(self, key, text):
+        self.search_timers.pop(key, None)
+        view = self.tab_views[key]
+        if text != view["search"]:
+            view["search"] = text
+            self.reload_view(key)
+
+    def sort_tab(self, key, index):
+        """Sort a tab by one of its columns; clicking the same column again reverses the order."""
+        view = self.tab_views[key]
+        descending = view["sort"] == (index, False)
+        view["sort"] = (index, descending)
+        table = view["table"]
+        for i, (column, text) in enumerate(zip(table["columns"], view["headings"])):
+            arrow = (" \u25bc" if descending else " \u25b2") if i == index else ""
+            table.heading(column, text=text + arrow)
+        self.reload_view(key)
+
+    def reload_view(self, key):
+        if key == "scores":
+            self.fetch_scores()
+        else:
+            self.load_tab(key)
+
+    def view_is_default(self, key):
+        """True if a tab shows its rows unsearched and in id order (as saved in the snapshot)."""
+        view = self.tab_views[key]
+        return not view["search"] and view["sort"] is None
+
+    def restore_snapshot(self):
+        """Render the unfiltered tabs saved at the last exit, then reconcile them with the database.
+
+        Returns False if there is no snapshot for this database.
+        """
+        saved = self.snapshot.load()
+        if not any(key in saved for key in self.tab_tables):
+            return False
 
-        self.clear_competition_filter()  # Load all data on startup
+        with self.profiler.ui_timer("snapshot", sum(len(entry[0]) for entry in saved.values())):
+            for table in REFERENCE_QUERIES:
+                if f"ref:{table}" in saved:
+                    self.reference_cache.seed(table, [tuple(row) for row in saved[f"ref:{table}"][0]])
+            competitions = self.reference_cache.peek("competitions", stale_ok=True)
+            if competitions:
+                self.competition_dropdown["values"] = [f"{comp[0]} - {comp[1]}" for comp in competitions]
+            for key, table in self.tab_tables.items():
+                if key in saved:
+                    rows, high_water, _, _ = saved[key]
+                    for values in rows:  # Saved as displayed, so TAB_FORMATS are not applied again
+                        table.insert("", "end", iid=str(values[0]), values=values)
+                    self.high_water[key] = high_water
+
+        for key in self.tab_tables:
+            if key in saved:
+                self.reconcile_tab(key)
+            else:
+                self.load_tab(key)
+        self.fetch_scores(initial_rows=saved["scores"][0] if "scores" in saved else None)
+        self.fetch_leaderboard()
+        self.fetch_dashboard()
+        return True
+
+    def reconcile_tab(self, key):
+        """Bring a tab restored from the snapshot up to date.
+
+        Rows added since are fetched past the saved high-water mark; rows deleted
+        since are found by comparing against the table's current ids.
+        """
+        saved_high_water = self.high_water.get(key, 0)
+        self.sync_tab(key)
+        self.run_background(f"{key}_ids", lambda: self.repo.existing_ids(key),
+                            lambda ids: self.prune_rows(key, ids, saved_high_water))
+
+    def prune_rows(self, key, ids, up_to):
+        """Remove rows (with ids up to up_to) that are no longer in the database."""
+        table = self.tab_tables[key]
+        live = {str(row_id) for row_id in ids}
+        gone = [iid for iid in table.get_children() if int(iid) <= up_to and iid not in live]
+        if gone:
+            table.delete(*gone)
+
+    def save_snapshot(self):
+        """Save the tabs for an instant start next time.
+
+        Skipped while a competition filter is active; searched or sorted tabs are
+        left out and load from the database at the next start.
+        """
+        if self.selected_competition_id is not None:
+            return
+        tabs = {}
+        for key, table in self.tab_tables.items():
+            if self.view_is_default(key):
+                rows = [table.item(iid, "values") for iid in table.get_children()]
+                tabs[key] = (rows, self.high_water.get(key, 0), None)
+        if self.score_pager.offset == 0 and self.view_is_default("scores"):  # Only the first rows are shown again at start
+            rows = [(iid,) + tuple(self.score_table.item(iid, "values")) for iid in self.score_table.get_children()]
+            tabs["scores"] = (rows, None, self.score_pager.total)
+        for table in REFERENCE_QUERIES:
+            rows = self.reference_cache.peek(table, stale_ok=True)
+            if rows is not None:
+                tabs[f"ref:{table}"] = (rows, None, None)
+        try:
+            self.snapshot.save(tabs)
+        except sqlite3.Error as e:
+            log.warning("Could not save the local snapshot: %s", e)
 
     def init_competition_selector(self):
         """Create a dropdown to select a competition and a button to clear the filter."""
@@ -119,15 +601,38 @@ class CompetitionDBApp(tk.Tk):
         self.clear_filter_btn = ttk.Button(frame, text="Clear Filter", command=self.clear_competition_filter)
         self.clear_filter_btn.pack(side="left", padx=5)
 
+        self.import_btn = ttk.Button(frame, text="Import...", command=self.import_data)
+        self.import_btn.pack(side="right", padx=5)
+
+        self.diagnostics_btn = ttk.Button(frame, text="Diagnostics...", command=self.show_diagnostics)
+        self.diagnostics_btn.pack(side="right", padx=5)
+
+        # Overview of the selected competition, from one aggregate query (see dashboard.py)
+        self.dashboard_label = ttk.Label(self, text="", anchor="w")
+        self.dashboard_label.pack(fill="x", padx=10)
+
+    def fetch_dashboard(self):
+        """Show the selected competition's counts and totals; after the first load only new scores are read."""
+        competition_id = self.selected_competition_id
+        if competition_id is None:
+            self.executor.cancel("dashboard")
+            self.dashboard_label.config(text="Select a competition to see its overview.")
+            return
+        self.run_background("dashboard", lambda: self.dashboard.get(competition_id), self.show_dashboard)
+
+    def show_dashboard(self, figures):
+        self.dashboard_label.config(text=(
+            f"Teams: {figures['teams']}    Players: {figures['players']}    "
+            f"Games played: {figures['games_played']} of {figures['games']}    "
+            f"Scores: {figures['scores']}    Points: {figures['points']:.2f}    "
+            f"Points per game: {figures['points_per_game']:.2f}"
+        ))
+
     def refresh_competition_list(self):
         """Populate the competition dropdown with data from the database."""
-        conn = connect_db(self.db_credentials)
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM competitions")
-            competitions = cursor.fetchall()
-            conn.close()
+        def populate(competitions):
             self.competition_dropdown["values"] = [f"{comp[0]} - {comp[1]}" for comp in competitions]
+        self.with_reference("competitions", populate)
 
     def clear_competition_filter(self):
         """Clear the competition filter and display all data."""
@@ -137,84 +642,21 @@ class CompetitionDBApp(tk.Tk):
 
     def fetch_all_data(self):
         """Fetch and refresh data for all tabs."""
-        if self.selected_competition_id:
-            self.fetch_teams()
-            self.fetch_scores()
-            self.fetch_games()
-            self.fetch_players()
-        else:
-            self.load_all_data()
+        self.load_all_data()
 
     def load_all_data(self):
-        """Load all data for all tabs when no competition is selected."""
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-
-                # Fetch all teams
-                cursor.execute("""
-                    SELECT teams.id, teams.name, competitions.name AS competition_name, teams.score
-                    FROM teams
-                    JOIN competitions ON teams.comp_id = competitions.id
-                """)
-                rows = cursor.fetchall()
-                for row in self.team_table.get_children():
-                    self.team_table.delete(row)
-                for row in rows:
-                    self.team_table.insert("", "end", values=row)
-
-                # Fetch all scores
-                cursor.execute("""
-                    SELECT 
-                        COALESCE(teams.name, 'N/A') AS team_name,
-                        COALESCE(players.name, 'N/A') AS player_name,
-                        games.name AS game_name,
-                        competitions.name AS competition_name,
-                        total_scores_log.points,
-                        total_scores_log.comment
-                    FROM total_scores_log
-                    LEFT JOIN teams ON total_scores_log.team_id = teams.id
-                    LEFT JOIN players ON total_scores_log.player_id = players.id
-                    JOIN games ON total_scores_log.game_id = games.id
-                    JOIN competitions ON games.comp_id = competitions.id
-                """)
-                rows = cursor.fetchall()
-                for row in self.score_table.get_children():
-                    self.score_table.delete(row)
-                for row in rows:
-                    self.score_table.insert("", "end", values=row)
-
-                # Fetch all games
-                cursor.execute("""
-                    SELECT games.id, competitions.name AS competition_name, games.name, 
-                           games.team_game, games.date_played, games.created_at
-                    FROM games
-                    JOIN competitions ON games.comp_id = competitions.id
-                """)
-                rows = cursor.fetchall()
-                for row in self.games_table.get_children():
-                    self.games_table.delete(row)
-                for row in rows:
-                    row = list(row)
-                    row[3] = "Yes" if row[3] else "No"  # Convert team_game boolean to "Yes" or "No"
-                    self.games_table.insert("", "end", values=row)
-
-                # Fetch all players
-                cursor.execute("""
-                    SELECT players.id, teams.name AS team_name, players.name AS player_name, players.created_at
-                    FROM players
-                    LEFT JOIN teams ON players.team_id = teams.id
-                """)
-                rows = cursor.fetchall()
-                for row in self.players_table.get_children():
-                    self.players_table.delete(row)
-                for row in rows:
-                    self.players_table.insert("", "end", values=row)
-
-                conn.close()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        """Load every tab at once, honouring the competition filter if one is set.
+
+        Each tab's query runs on its own worker and pooled connection, and each
+        tab is populated as soon as its own rows arrive.
+        """
+        self.fetch_teams()
+        self.fetch_scores()
+        self.fetch_games()
+        self.fetch_players()
+        self.fetch_leaderboard()
+        self.fetch_dashboard()
+        self.show_analytics_if_selected()
 
     def on_competition_selected(self, event):
         """Handle competition selection from the dropdown."""
@@ -223,6 +665,84 @@ class CompetitionDBApp(tk.Tk):
             self.selected_competition_id = int(selected.split(" - ")[0])  # Extract competition ID
             self.fetch_all_data()
 
+    def show_diagnostics(self):
+        """Open a window listing recent query/Treeview timings, with slow ones highlighted."""
+        window = tk.Toplevel(self)
+        window.title("Diagnostics")
+        window.geometry("1000x500")
+
+        controls = ttk.Frame(window)
+        controls.pack(fill="x", pady=5)
+        tk.Label(controls, text="Slow threshold (ms):").pack(side="left", padx=5)
+        threshold_var = tk.StringVar(value=str(self.profiler.slow_ms))
+        tk.Entry(controls, textvariable=threshold_var, width=8).pack(side="left")
+        summary_label = tk.Label(controls, text="")
+        summary_label.pack(side="left", padx=10)
+
+        notebook = ttk.Notebook(window)
+        notebook.pack(fill="both", expand=True)
+
+        columns = ("Time", "Kind", "Label", "DB ms", "Fetch ms", "UI ms", "Rows", "Statement")
+        recent_table = ttk.Treeview(notebook, columns=columns, show="headings")
+        for column, width in zip(columns, (70, 50, 120, 70, 70, 70, 60, 480)):
+            recent_table.heading(column, text=column)
+            recent_table.column(column, width=width, stretch=column == "Statement")
+        recent_table.tag_configure("slow", background="#f8d0d0")
+        notebook.add(recent_table, text="Recent")
+
+        summary_columns = ("Label", "Count", "Avg ms", "Max ms", "Rows", "Statement")
+        summary_table = ttk.Treeview(notebook, columns=summary_columns, show="headings")
+        for column, width in zip(summary_columns, (120, 60, 70, 70, 70, 560)):
+            summary_table.heading(column, text=column)
+            summary_table.column(column, width=width, stretch=column == "Statement")
+        summary_table.tag_configure("slow", background="#f8d0d0")
+        notebook.add(summary_table, text="By statement")
+
+        last_seq = [0]
+
+        def apply_threshold():
+            try:
+                self.profiler.slow_ms = float(threshold_var.get())
+            except ValueError:
+                self.profiler.slow_ms = SLOW_QUERY_MS
+            for item in recent_table.get_children():
+                total = sum(float(value) for value in recent_table.item(item, "values")[3:6])
+                recent_table.item(item, tags=("slow",) if total > self.profiler.slow_ms else ())
+
+        def refresh():
+            if not window.winfo_exists():
+                return
+            records = self.profiler.records_since(last_seq[0])
+            for record in records:
+                recent_table.insert("", 0, values=(
+                    time.strftime("%H:%M:%S", time.localtime(record["at"])), record["kind"], record["label"],
+                    record.get("db_ms", 0), record.get("fetch_ms", 0), record.get("ui_ms", 0), record["rows"],
+                    record.get("error") or record["fingerprint"],
+                ), tags=("slow",) if record["total_ms"] > self.profiler.slow_ms else ())
+                last_seq[0] = record["seq"]
+            overflow = recent_table.get_children()[self.profiler.history_size:]
+            if overflow:
+                recent_table.delete(*overflow)
+
+            summary_table.delete(*summary_table.get_children())
+            slow = 0
+            for label, text, count, average, worst, rows in self.profiler.summary():
+                slow += worst > self.profiler.slow_ms
+                summary_table.insert("", "end", values=(label, count, f"{average:.1f}", f"{worst:.1f}", rows, text),
+                                     tags=("slow",) if worst > self.profiler.slow_ms else ())
+            summary_label.config(text=f"{len(recent_table.get_children())} records, {slow} slow statements")
+            window.after(DIAGNOSTICS_REFRESH_MS, refresh)
+
+        def clear():
+            self.profiler.clear()
+            recent_table.delete(*recent_table.get_children())
+            summary_table.delete(*summary_table.get_children())
+            summary_label.config(text="")
+
+        ttk.Button(controls, text="Apply", command=apply_threshold).pack(side="left")
+        ttk.Button(controls, text="Clear", command=clear).pack(side="right", padx=5)
+        refresh()
+
     def init_team_tab(self):
         """Initialize the Teams tab with input fields and a table."""
         frame = ttk.Frame(self.team_tab)
@@ -237,31 +757,26 @@ class CompetitionDBApp(tk.Tk):
         self.delete_team_btn = ttk.Button(frame, text="Delete Team", command=self.delete_team)
         self.delete_team_btn.pack(pady=5)
 
+        self.export_teams_btn = ttk.Button(frame, text="Export Teams...", command=self.export_teams)
+        self.export_teams_btn.pack(pady=5)
+
         self.team_table = ttk.Treeview(frame, columns=("ID", "Name", "Comp ID", "Score"), show="headings")
         self.team_table.heading("ID", text="ID")
         self.team_table.heading("Name", text="Name")
         self.team_table.heading("Comp ID", text="Competition Name")
         self.team_table.heading("Score", text="Score")
         self.team_table.pack(fill="both", expand=True)
+        self.add_view_controls("teams", self.team_table, self.team_table)
 
     def delete_team(self):
-        """Delete the selected team from the database."""
+        """Delete the selected team, its players and their scores."""
         selected_item = self.team_table.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a team to delete.")
             return
 
-        team_id = self.team_table.item(selected_item, "values")[0]
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM teams WHERE id = %s", (team_id,))
-                conn.commit()
-                conn.close()
-                self.fetch_all_data()  # Automatically refresh data
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        values = self.team_table.item(selected_item, "values")
+        self.confirm_cascade_delete("teams", values[0], f"team '{values[1]}'")
 
     def init_score_tab(self):
         """Initialize the Scores tab with input fields and a table."""
@@ -274,10 +789,24 @@ class CompetitionDBApp(tk.Tk):
         self.add_score_btn = ttk.Button(frame, text="Add Score", command=self.add_score)
         self.add_score_btn.pack(pady=5)
 
+        self.bulk_score_btn = ttk.Button(frame, text="Bulk Add Scores", command=self.bulk_add_scores)
+        self.bulk_score_btn.pack(pady=5)
+
         self.delete_score_btn = ttk.Button(frame, text="Delete Score", command=self.delete_score)
         self.delete_score_btn.pack(pady=5)
 
-        self.score_table = ttk.Treeview(frame, columns=("Team Name", "Player Name", "Game Name", "Competition Name", "Points", "Comment"), show="headings")
+        self.export_scores_btn = ttk.Button(frame, text="Export Scores...", command=self.export_scores)
+        self.export_scores_btn.pack(pady=5)
+
+        self.score_status = ttk.Label(frame, text="")
+        self.score_status.pack(pady=2)
+
+        table_frame = ttk.Frame(frame)
+        table_frame.pack(fill="both", expand=True)
+        score_scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        score_scrollbar.pack(side="right", fill="y")
+
+        self.score_table = ttk.Treeview(table_frame, columns=("Team Name", "Player Name", "Game Name", "Competition Name", "Points", "Comment"), show="headings")
         self.score_table.heading("Team Name", text="Team Name")
         self.score_table.heading("Player Name", text="Player Name")
         self.score_table.heading("Game Name", text="Game Name")
@@ -285,6 +814,7 @@ class CompetitionDBApp(tk.Tk):
         self.score_table.heading("Points", text="Points")
         self.score_table.heading("Comment", text="Comment")
         self.score_table.pack(fill="both", expand=True)
+        self.add_view_controls("scores", self.score_table, table_frame)
 
         # Adjust column widths to ensure all fields are visible
         self.score_table.column("Team Name", width=150)
@@ -294,6 +824,14 @@ class CompetitionDBApp(tk.Tk):
         self.score_table.column("Points", width=100)
         self.score_table.column("Comment", width=250)
 
+        # Only a few pages of scores are materialized; more are fetched as the user scrolls
+        self.score_pager = PagedTreeview(
+            self.score_table, score_scrollbar, self.executor, "scores",
+            on_status=lambda text: self.score_status.config(text=text),
+            on_error=self.show_db_error,
+            profiler=self.profiler
+        )
+
     def delete_score(self):
         """Delete the selected score from the database."""
         selected_item = self.score_table.selection()
@@ -301,17 +839,17 @@ class CompetitionDBApp(tk.Tk):
             messagebox.showwarning("Selection Error", "Please select a score to delete.")
             return
 
-        score_id = self.score_table.item(selected_item, "values")[0]
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM total_scores_log WHERE id = %s", (score_id,))
-                conn.commit()
-                conn.close()
-                self.fetch_all_data()  # Automatically refresh data
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        score_id = selected_item[0]  # Score rows use the score id as their item id
+
+        def done(competition_id):
+            self.score_pager.remove(score_id)
+            if competition_id is None:
+                return  # Someone else deleted it first; their change event refreshes the rest
+            self.dashboard.invalidate(competition_id)  # Deleted points cannot be subtracted incrementally
+            self.fetch_dashboard()
+            self.fetch_leaderboard()  # Other desks refresh on the change event; this desk does not receive its own
+            self.scores_changed(competition_id)
+        self.run_background(None, lambda: self.repo.delete_score(score_id), done)
 
     def init_games_tab(self):
         """Initialize the Games tab with input fields and a table."""
@@ -335,25 +873,17 @@ class CompetitionDBApp(tk.Tk):
         self.games_table.heading("Date Played", text="Date Played")
         self.games_table.heading("Created At", text="Created At")
         self.games_table.pack(fill="both", expand=True)
+        self.add_view_controls("games", self.games_table, self.games_table)
 
     def delete_game(self):
-        """Delete the selected game from the database."""
+        """Delete the selected game and its scores."""
         selected_item = self.games_table.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a game to delete.")
             return
 
-        game_id = self.games_table.item(selected_item, "values")[0]
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM games WHERE id = %s", (game_id,))
-                conn.commit()
-                conn.close()
-                self.fetch_all_data()  # Automatically refresh data
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        values = self.games_table.item(selected_item, "values")
+        self.confirm_cascade_delete("games", values[0], f"game '{values[2]}'")
 
     def init_players_tab(self):
         """Initialize the Players tab with input fields and a table."""
@@ -375,25 +905,17 @@ class CompetitionDBApp(tk.Tk):
         self.players_table.heading("Player Name", text="Player Name")
         self.players_table.heading("Created At", text="Created At")
         self.players_table.pack(fill="both", expand=True)
+        self.add_view_controls("players", self.players_table, self.players_table)
 
     def delete_player(self):
-        """Delete the selected player from the database."""
+        """Delete the selected player and their scores."""
         selected_item = self.players_table.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a player to delete.")
             return
 
-        player_id = self.players_table.item(selected_item, "values")[0]
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM players WHERE id = %s", (player_id,))
-                conn.commit()
-                conn.close()
-                self.fetch_all_data()  # Automatically refresh data
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        values = self.players_table.item(selected_item, "values")
+        self.confirm_cascade_delete("players", values[0], f"player '{values[2]}'")
 
     def init_competitions_tab(self):
         """Initialize the Competitions tab with input fields and a table."""
@@ -416,69 +938,206 @@ class CompetitionDBApp(tk.Tk):
         self.competitions_table.heading("End Date", text="End Date")
         self.competitions_table.heading("Created At", text="Created At")
         self.competitions_table.pack(fill="both", expand=True)
+        self.add_view_controls("competitions", self.competitions_table, self.competitions_table)
 
     def delete_competition(self):
-        """Delete the selected competition from the database."""
+        """Delete the selected competition with its teams, players, games and scores."""
         selected_item = self.competitions_table.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a competition to delete.")
             return
 
-        competition_id = self.competitions_table.item(selected_item, "values")[0]
-        conn = connect_db(self.db_credentials)
-        if conn:
-            try:
-                cursor = conn.cursor()
-
-                # Check if the competition is referenced in other tables
-                cursor.execute("""
-                    SELECT COUNT(*) FROM teams WHERE comp_id = %s
-                """, (competition_id,))
-                team_count = cursor.fetchone()[0]
-
-                cursor.execute("""
-                    SELECT COUNT(*) FROM games WHERE comp_id = %s
-                """, (competition_id,))
-                game_count = cursor.fetchone()[0]
-
-                if team_count > 0 or game_count > 0:
-                    messagebox.showerror(
-                        "Delete Error",
-                        "This competition cannot be deleted because it is referenced in other tables (Teams or Games)."
-                    )
-                    conn.close()
-                    return
-
-                # Proceed with deletion if no references exist
-                cursor.execute("DELETE FROM competitions WHERE id = %s", (competition_id,))
-                conn.commit()
-                conn.close()
-                self.fetch_all_data()  # Automatically refresh data
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        values = self.competitions_table.item(selected_item, "values")
+        self.confirm_cascade_delete("competitions", values[0], f"competition '{values[1]}'")
+
+    def confirm_cascade_delete(self, table, row_id, description):
+        """Show everything deleting a row would remove and, once confirmed, delete it in one transaction."""
+        def confirm(impact):
+            lines = [f"  {count} {key if count != 1 else key[:-1]}" for key, count in impact.items() if count]
+            if not messagebox.askyesno(
+                "Confirm Delete",
+                f"Delete {description}?\n\nThis permanently deletes:\n" + "\n".join(lines)
+            ):
+                return
+            self.run_background(None, lambda: self.repo.cascade_delete(table, row_id), self.on_cascade_deleted)
+        self.run_background(None, lambda: self.repo.deletion_impact(table, row_id), confirm)
+
+    def on_cascade_deleted(self, deleted):
+        """Drop the deleted rows from the tabs and refresh what depended on them."""
+        for key, ids in deleted.items():
+            if key == "scores" or not ids:
+                continue
+            self.reference_cache.invalidate(key)
+            for row_id in ids:
+                self.remove_row(key, row_id)
+        gone = {str(row_id) for row_id in deleted.get("competitions", ())}
+        if gone:
+            self.competition_dropdown["values"] = [
+                value for value in self.competition_dropdown["values"] if value.split(" - ")[0] not in gone
+            ]
+            if str(self.selected_competition_id) in gone:
+                self.clear_competition_filter()
+                return
+        if deleted["scores"]:
+            self.fetch_scores()
+            self.scores_changed()
+        self.dashboard.invalidate()
+        if self.selected_competition_id is not None:
+            self.fetch_leaderboard()
+            self.fetch_dashboard()
+
+    def init_leaderboard_tab(self):
+        """Initialize the Leaderboard tab with team totals per game for the selected competition."""
+        frame = ttk.Frame(self.leaderboard_tab)
+        frame.pack(fill="both", expand=True)
 
-    def fetch_teams(self):
-        """Fetch and display teams for the selected competition."""
-        conn = connect_db(self.db_credentials)
-        if conn is None or self.selected_competition_id is None:
+        self.refresh_leaderboard_btn = ttk.Button(frame, text="Refresh Leaderboard", command=self.fetch_leaderboard)
+        self.refresh_leaderboard_btn.pack(pady=5)
+
+        self.enable_summary_btn = ttk.Button(frame, text="Maintain Summary Table", command=self.enable_leaderboard_summary)
+        self.enable_summary_btn.pack(pady=5)
+
+        self.leaderboard_status = ttk.Label(frame, text="")
+        self.leaderboard_status.pack(pady=2)
+
+        self.leaderboard_table = ttk.Treeview(frame, columns=("Rank", "Team", "Total"), show="headings")
+        self.leaderboard_table.pack(fill="both", expand=True)
+        self.show_leaderboard([], [])
+
+    def show_leaderboard(self, game_names, rows):
+        """Rebuild the leaderboard columns (one per game) and rows."""
+        columns = ["Rank", "Team", "Total"] + [f"game_{i}" for i in range(len(game_names))]
+        self.leaderboard_table.delete(*self.leaderboard_table.get_children())
+        self.leaderboard_table.configure(columns=columns)
+        for column, text in zip(columns, ["Rank", "Team", "Total"] + list(game_names)):
+            self.leaderboard_table.heading(column, text=text)
+            self.leaderboard_table.column(column, width=60 if column == "Rank" else 120)
+        with self.profiler.ui_timer("leaderboard", len(rows)):
+            for row in rows:
+                self.leaderboard_table.insert("", "end", values=row)
+
+    def fetch_leaderboard(self):
+        """Compute the leaderboard for the selected competition with one grouped query."""
+        competition_id = self.selected_competition_id
+        if competition_id is None:
+            self.executor.cancel("leaderboard")
+            self.show_leaderboard([], [])
+            self.leaderboard_status.config(text="Select a competition to see its leaderboard.")
             return
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT teams.id, teams.name, competitions.name AS competition_name, teams.score
-                FROM teams
-                JOIN competitions ON teams.comp_id = competitions.id
-                WHERE competitions.id = %s
-            """, (self.selected_competition_id,))
-            rows = cursor.fetchall()
-            conn.close()
 
-            for row in self.team_table.get_children():
-                self.team_table.delete(row)
+        def done(result):
+            self.show_leaderboard(*result)
+            self.leaderboard_status.config(text=f"{len(result[1])} teams")
+
+        self.run_background("leaderboard", lambda: self.repo.leaderboard(competition_id), done)
+
+    def enable_leaderboard_summary(self):
+        """Create and fill the summary table that score inserts then keep up to date."""
+        if not messagebox.askyesno(
+            "Maintain Summary Table",
+            "Create the leaderboard summary table and rebuild it from the score log?\n"
+            "Afterwards every score insert and delete also updates it."
+        ):
+            return
+
+        self.run_background(None, self.repo.enable_leaderboard_summary, lambda _: self.fetch_leaderboard())
+
+    def init_analytics_tab(self):
+        """Initialize the Analytics tab: views computed from one cached load of the competition's score log."""
+        frame = ttk.Frame(self.analytics_tab)
+        frame.pack(fill="both", expand=True)
+
+        controls = ttk.Frame(frame)
+        controls.pack(fill="x", pady=5)
+        tk.Label(controls, text="View:").pack(side="left", padx=5)
+        self.analytics_view = ttk.Combobox(controls, values=list(ANALYTICS_VIEWS) + [HEAD_TO_HEAD],
+                                           state="readonly", width=20)
+        self.analytics_view.set("Rankings")
+        self.analytics_view.pack(side="left")
+        self.analytics_view.bind("<<ComboboxSelected>>", lambda event: self.fetch_analytics())
+
+        # The two teams compared by the head-to-head view
+        self.head_to_head_teams = {}  # Choice text -> team id
+        self.head_to_head_pickers = []
+        for label in ("Team A:", "Team B:"):
+            tk.Label(controls, text=label).pack(side="left", padx=(10, 5))
+            picker = ttk.Combobox(controls, state="readonly", width=20)
+            picker.pack(side="left")
+            picker.bind("<<ComboboxSelected>>", lambda event: self.fetch_analytics())
+            self.head_to_head_pickers.append(picker)
+
+        ttk.Button(controls, text="Refresh", command=self.fetch_analytics).pack(side="right", padx=5)
+
+        self.analytics_status = ttk.Label(frame, text="")
+        self.analytics_status.pack(pady=2)
+        self.analytics_table = ttk.Treeview(frame, show="headings")
+        self.analytics_table.pack(fill="both", expand=True)
+
+    def show_analytics_if_selected(self):
+        """Bring the Analytics tab up to date, but only while it is the one on screen."""
+        if self.tabs.select() == str(self.analytics_tab):
+            self.fetch_analytics()
+
+    def scores_changed(self, *competition_ids):
+        """Drop cached score frames (of the given competitions, or all) after scores were added or deleted."""
+        for competition_id in competition_ids or (None,):
+            self.score_analytics.invalidate(competition_id)
+        self.show_analytics_if_selected()
+
+    def fetch_analytics(self):
+        """Compute the chosen view on a worker from the competition's cached score frame."""
+        competition_id = self.selected_competition_id
+        if competition_id is None:
+            self.executor.cancel("analytics")
+            self.show_analytics(([], [], "Select a competition to see its analytics.", None))
+            return
+        view = self.analytics_view.get()
+        pair = tuple(self.head_to_head_teams.get(picker.get()) for picker in self.head_to_head_pickers)
+
+        def work():
+            frame = self.score_analytics.frame(competition_id)
+            teams = scored_teams(frame)
+            if view != HEAD_TO_HEAD:
+                headers, rows = display_rows(ANALYTICS_VIEWS[view](frame))
+                return headers, rows, f"{len(frame)} scores", teams
+            if None in pair:
+                return [], [], "Pick two teams to compare.", teams
+            if pair[0] == pair[1]:
+                return [], [], "Pick two different teams.", teams
+            summary, per_game = head_to_head(frame, *pair)
+            status = (f"{summary['games']} games in common: {summary['wins']} won, {summary['losses']} lost, "
+                      f"{summary['draws']} drawn, point difference {summary['point_difference']:+.2f}")
+            return display_rows(per_game) + (status, teams)
+
+        self.executor.submit("analytics", work, self.show_analytics, self.show_analytics_error)
+
+    def show_analytics(self, result):
+        headers, rows, status, teams = result
+        self.analytics_table.delete(*self.analytics_table.get_children())
+        self.analytics_table.configure(columns=[f"col_{i}" for i in range(len(headers))])
+        for i, header in enumerate(headers):
+            self.analytics_table.heading(f"col_{i}", text=ANALYTICS_HEADINGS.get(header, header))
+            self.analytics_table.column(f"col_{i}", width=100)
+        with self.profiler.ui_timer("analytics", len(rows)):
             for row in rows:
-                self.team_table.insert("", "end", values=row)
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", str(e))
+                self.analytics_table.insert("", "end", values=row)
+        self.analytics_status.config(text=status)
+        if teams is not None:
+            self.head_to_head_teams = {f"{team_id} - {name}": team_id for team_id, name in teams}
+            for picker in self.head_to_head_pickers:
+                picker["values"] = list(self.head_to_head_teams)
+                if picker.get() not in self.head_to_head_teams:
+                    picker.set("")
+
+    def show_analytics_error(self, error):
+        if isinstance(error, mysql.connector.Error):
+            self.show_db_error(error)
+        else:  # e.g. pandas is not installed
+            self.analytics_status.config(text=str(error))
+
+    def fetch_teams(self):
+        """Fetch and display teams for the selected competition (all teams if none is selected)."""
+        self.load_tab("teams")
 
     def add_team(self):
         """Add a new team to the database."""
@@ -492,18 +1151,12 @@ class CompetitionDBApp(tk.Tk):
 
             comp_id = int(selected_comp.split(" - ")[0])  # Extract competition ID
 
-            conn = connect_db(self.db_credentials)
-            if conn is None:
-                return
-            try:
-                cursor = conn.cursor()
-                cursor.execute("INSERT INTO teams (name, comp_id, created_at, score) VALUES (%s, %s, NOW(), 0)", (team_name, comp_id))
-                conn.commit()
-                conn.close()
-                team_window.destroy()
-                self.fetch_teams()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+            def saved():
+                self.reference_cache.invalidate("teams")
+                self.sync_tab("teams")
+                self.fetch_dashboard()
+            self.submit_write(team_window, lambda key: self.repo.add_team(team_name, comp_id, key), saved,
+                              "team", (team_name, comp_id))
 
         team_window = tk.Toplevel(self)
         team_window.title("Add Team")
@@ -516,204 +1169,78 @@ class CompetitionDBApp(tk.Tk):
         competition_dropdown = ttk.Combobox(team_window, state="readonly", width=40)
         competition_dropdown.grid(row=1, column=1)
 
-        conn = connect_db(self.db_credentials)
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM competitions")
-            competitions = cursor.fetchall()
-            conn.close()
+        def populate(competitions):
             competition_dropdown["values"] = [f"{comp[0]} - {comp[1]}" for comp in competitions]
+        self.with_reference("competitions", populate, team_window)
 
         submit_btn = tk.Button(team_window, text="Submit", command=submit_team)
         submit_btn.grid(row=2, column=0, columnspan=2)
 
-    def fetch_scores(self):
-        """Fetch and display scores for the selected competition."""
-        conn = connect_db(self.db_credentials)
-        if conn is None or self.selected_competition_id is None:
-            return
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    COALESCE(teams.name, 'N/A') AS team_name,
-                    COALESCE(players.name, 'N/A') AS player_name,
-                    games.name AS game_name,
-                    competitions.name AS competition_name,
-                    total_scores_log.points,
-                    total_scores_log.comment
-                FROM total_scores_log
-                LEFT JOIN teams ON total_scores_log.team_id = teams.id
-                LEFT JOIN players ON total_scores_log.player_id = players.id
-                JOIN games ON total_scores_log.game_id = games.id
-                JOIN competitions ON games.comp_id = competitions.id
-                WHERE competitions.id = %s
-            """, (self.selected_competition_id,))
-            rows = cursor.fetchall()
-            conn.close()
-
-            for row in self.score_table.get_children():
-                self.score_table.delete(row)
-            for row in rows:
-                self.score_table.insert("", "end", values=row)
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", str(e))
+    def fetch_scores(self, initial_rows=None):
+        """Fetch and display scores, for the selected competition if there is one.
+
+        initial_rows (e.g. from the snapshot) are shown until the first page arrives.
+        """
+        competition_id = self.selected_competition_id
+        search, sort = self.tab_views["scores"]["search"], self.tab_views["scores"]["sort"]
+        self.score_pager.reset(
+            lambda after_id, before_id, limit: self.repo.score_page(competition_id, after_id, before_id, limit, search, sort),
+            lambda: self.repo.count_scores(competition_id, search),
+            initial_rows
+        )
 
     def fetch_games(self):
-        """Fetch and display games for the selected competition."""
-        conn = connect_db(self.db_credentials)
-        if conn is None or self.selected_competition_id is None:
-            return
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT games.id, competitions.name AS competition_name, games.name, 
-                       games.team_game, games.date_played, games.created_at
-                FROM games
-                JOIN competitions ON games.comp_id = competitions.id
-                WHERE competitions.id = %s
-            """, (self.selected_competition_id,))
-            rows = cursor.fetchall()
-            conn.close()
-
-            for row in self.games_table.get_children():
-                self.games_table.delete(row)
-            for row in rows:
-                row = list(row)
-                row[3] = "Yes" if row[3] else "No"  # Convert team_game boolean to "Yes" or "No"
-                self.games_table.insert("", "end", values=row)
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", str(e))
+        """Fetch and display games for the selected competition (all games if none is selected)."""
+        self.load_tab("games")
 
     def fetch_players(self):
-        """Fetch and display players for the selected competition."""
-        conn = connect_db(self.db_credentials)
-        if conn is None or self.selected_competition_id is None:
-            return
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT players.id, teams.name AS team_name, players.name AS player_name, players.created_at
-                FROM players
-                LEFT JOIN teams ON players.team_id = teams.id
-                WHERE teams.comp_id = %s
-            """, (self.selected_competition_id,))
-            rows = cursor.fetchall()
-            conn.close()
-
-            for row in self.players_table.get_children():
-                self.players_table.delete(row)
-            for row in rows:
-                self.players_table.insert("", "end", values=row)
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", str(e))
+        """Fetch and display players for the selected competition (all players if none is selected)."""
+        self.load_tab("players")
 
     def fetch_competitions(self):
         """Fetch and display all competitions."""
-        conn = connect_db(self.db_credentials)
-        if conn is None:
-            return
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, start_date, end_date, created_at
-                FROM competitions
-            """)
-            rows = cursor.fetchall()
-            conn.close()
-
-            for row in self.competitions_table.get_children():
-                self.competitions_table.delete(row)
-            for row in rows:
-                self.competitions_table.insert("", "end", values=row)
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", str(e))
+        self.load_tab("competitions")
 
     def add_score(self):
         """Add a new score to the database."""
+        games_by_name = {}  # name -> (id, name, team_game, comp_id), filled from the reference cache
+
         def update_team_game_status(event):
-            game_name = game_dropdown.get()
-            if not game_name:
+            game = games_by_name.get(game_dropdown.get())
+            if game is None:
                 return
+            is_team_game = bool(game[2])
+            team_game_var.set(is_team_game)
+            # Offer only this game's competition, looked up by name prefix as the user types
+            table, comp_id = ("teams" if is_team_game else "players"), game[3]
+            team_or_player_picker.set_search(lambda prefix: self.name_matches(table, prefix, comp_id))
 
-            conn = connect_db(self.db_credentials)
-            if conn is None:
-                return
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT team_game FROM games WHERE name = %s", (game_name,))
-                team_game = cursor.fetchone()
-                conn.close()
-                if team_game and team_game[0]:
-                    team_game_var.set(True)
-                    update_team_or_player_dropdown(is_team_game=True)
-                else:
-                    team_game_var.set(False)
-                    update_team_or_player_dropdown(is_team_game=False)
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
-
-        def update_team_or_player_dropdown(is_team_game):
-            conn = connect_db(self.db_credentials)
-            if conn is None:
-                return
-            try:
-                cursor = conn.cursor()
-                if is_team_game:
-                    cursor.execute("SELECT id, name FROM teams")
-                    items = [f"{row[0]} - {row[1]}" for row in cursor.fetchall()]
-                else:
-                    cursor.execute("""
-                        SELECT players.id, players.name, teams.name AS team_name
-                        FROM players
-                        LEFT JOIN teams ON players.team_id = teams.id
-                    """)
-                    items = [f"{row[0]} - {row[1]} (Team: {row[2]})" for row in cursor.fetchall()]
-                conn.close()
-                team_or_player_dropdown["values"] = items
-                team_or_player_dropdown.set("")  # Clear selection
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+        def format_choice(row):
+            return f"{row[0]} - {row[1]}" if len(row) == 2 else f"{row[0]} - {row[1]} (Team: {row[2]})"
 
         def submit_score():
-            game_name = game_dropdown.get()
+            game = games_by_name.get(game_dropdown.get())
             points = points_input.get().strip()
             comment = comment_input.get().strip()
-            selected_item = team_or_player_dropdown.get()
+            selected_row = team_or_player_picker.selected()
             is_team_game = team_game_var.get()
 
-            if not game_name or not points or not selected_item:
+            if game is None or not points or not team_or_player_dropdown.get():
                 messagebox.showwarning("Input Error", "Game, Points, and Team/Player selection are required.")
                 return
-
-            conn = connect_db(self.db_credentials)
-            if conn is None:
+            if selected_row is None:
+                messagebox.showwarning("Input Error", "Please pick a team or player from the list.")
                 return
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM games WHERE name = %s", (game_name,))
-                game_id = cursor.fetchone()
-                if not game_id:
-                    messagebox.showerror("Input Error", "Invalid game selected.")
-                    return
-
-                selected_id = selected_item.split(" - ")[0]  # Extract ID from dropdown value
-                if is_team_game:
-                    cursor.execute(
-                        "INSERT INTO team_scores_log (team_id, game_id, points, comment, created_at) VALUES (%s, %s, %s, %s, NOW())",
-                        (selected_id, game_id[0], points, comment)
-                    )
-                else:
-                    cursor.execute(
-                        "INSERT INTO player_scores_log (player_id, game_id, points, comment, created_at) VALUES (%s, %s, %s, %s, NOW())",
-                        (selected_id, game_id[0], points, comment)
-                    )
-                conn.commit()
-                conn.close()
-                score_window.destroy()
-                self.fetch_scores()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+
+            score = (is_team_game, selected_row[0], game[0], points, comment)
+
+            def saved():
+                self.score_pager.refresh_tail()
+                self.fetch_dashboard()
+                self.fetch_leaderboard()  # This desk's own change events are not sent back to it
+                self.scores_changed()
+            self.submit_write(score_window, lambda key: self.repo.add_score(*score, idempotency_key=key), saved,
+                              "score", score)
 
         score_window = tk.Toplevel(self)
         score_window.title("Add Score")
@@ -722,14 +1249,12 @@ class CompetitionDBApp(tk.Tk):
         game_dropdown = ttk.Combobox(score_window, state="readonly", width=40)  # Increased width
         game_dropdown.grid(row=0, column=1)
 
-        conn = connect_db(self.db_credentials)
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM games")
-            games = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            game_dropdown["values"] = games
+        def populate_games(games):
+            games_by_name.clear()
+            games_by_name.update((game[1], game) for game in games)
+            game_dropdown["values"] = list(games_by_name)
             game_dropdown.bind("<<ComboboxSelected>>", update_team_game_status)
+        self.with_reference("games", populate_games, score_window)
 
         tk.Label(score_window, text="Points:").grid(row=1, column=0, sticky="w")
         points_input = tk.Entry(score_window)
@@ -743,12 +1268,225 @@ class CompetitionDBApp(tk.Tk):
         tk.Checkbutton(score_window, text="Team Game", variable=team_game_var, state="disabled").grid(row=3, column=0, columnspan=2)
 
         tk.Label(score_window, text="Team/Player:").grid(row=4, column=0, sticky="w")
-        team_or_player_dropdown = ttk.Combobox(score_window, state="readonly", width=40)  # Increased width
+        team_or_player_dropdown = ttk.Combobox(score_window, width=40)  # Type to search, then pick
         team_or_player_dropdown.grid(row=4, column=1)
+        team_or_player_picker = TypeaheadPicker(
+            team_or_player_dropdown, self.executor, "score_picker", format_choice, on_error=self.show_db_error
+        )
 
         submit_btn = tk.Button(score_window, text="Submit", command=submit_score)
         submit_btn.grid(row=5, column=0, columnspan=2)
 
+    def bulk_add_scores(self):
+        """Stage many scores locally and insert them all in one transaction."""
+        games_by_name = {}  # name -> (id, team_game), filled from the reference cache
+        valid_ids = {"teams": set(), "players": set()}
+        staged = []  # (is_team_game, entity_id, game_id, points, comment) per staged row
+
+        def on_game_selected(event=None):
+            game = games_by_name.get(game_dropdown.get())
+            if game is None:
+                return
+            is_team_game = bool(game[1])
+            team_game_var.set(is_team_game)
+
+            def populate(rows):
+                if is_team_game:
+                    items = [f"{row[0]} - {row[1]}" for row in rows]
+                else:
+                    items = [f"{row[0]} - {row[1]} (Team: {row[2]})" for row in rows]
+                team_or_player_dropdown["values"] = items
+            self.with_reference("teams" if is_team_game else "players", populate, bulk_window)
+
+        def stage_score(event=None):
+            """Validate the entry row against the cached ids and add it to the staging table."""
+            game_name = game_dropdown.get()
+            selected_item = team_or_player_dropdown.get().strip()
+            points = points_input.get().strip()
+            comment = comment_input.get().strip()
+
+            game = games_by_name.get(game_name)
+            if game is None:
+                messagebox.showwarning("Input Error", "Select a valid game.", parent=bulk_window)
+                return
+            is_team_game = bool(game[1])
+            try:
+                entity_id = int(selected_item.split(" - ")[0])  # Accepts a picked item or a typed id
+            except ValueError:
+                entity_id = None
+            if entity_id not in valid_ids["teams" if is_team_game else "players"]:
+                kind = "team" if is_team_game else "player"
+                messagebox.showwarning("Input Error", f"Select a valid {kind} for this game.", parent=bulk_window)
+                return
+            try:
+                float(points)
+            except ValueError:
+                messagebox.showwarning("Input Error", "Points must be a number.", parent=bulk_window)
+                return
+
+            staged.append((is_team_game, entity_id, game[0], points, comment))
+            staging_table.insert("", "end", iid=str(len(staged) - 1),
+                                 values=(game_name, selected_item, points, comment))
+            status_label.config(text=f"{len(staging_table.get_children())} scores staged")
+
+            # Keep the game selected so a whole round can be keyed quickly
+            points_input.delete(0, "end")
+            comment_input.delete(0, "end")
+            team_or_player_dropdown.set("")
+            team_or_player_dropdown.focus_set()
+
+        def remove_staged():
+            for item in staging_table.selection():
+                staging_table.delete(item)
+            status_label.config(text=f"{len(staging_table.get_children())} scores staged")
+
+        def commit_scores():
+            rows = [staged[int(item)] for item in staging_table.get_children()]
+            if not rows:
+                messagebox.showwarning("Input Error", "No scores staged.", parent=bulk_window)
+                return
+            team_rows = [row[1:] for row in rows if row[0]]
+            player_rows = [row[1:] for row in rows if not row[0]]
+
+            def done(_):
+                if bulk_window.winfo_exists():
+                    bulk_window.destroy()
+                self.score_pager.refresh_tail()
+                self.fetch_dashboard()
+                self.fetch_leaderboard()
+                self.scores_changed()
+                messagebox.showinfo("Scores Added", f"Added {len(rows)} scores.")
+
+            commit_btn.config(state="disabled")
+
+            def failed(error):
+                if bulk_window.winfo_exists():
+                    commit_btn.config(state="normal")
+                self.show_db_error(error)
+
+            # One transaction: nothing from the batch is kept if any row fails
+            self.executor.submit(None, lambda: self.repo.add_scores(team_rows, player_rows), done, failed)
+
+        bulk_window = tk.Toplevel(self)
+        bulk_window.title("Bulk Add Scores")
+
+        tk.Label(bulk_window, text="Game:").grid(row=0, column=0, sticky="w")
+        game_dropdown = ttk.Combobox(bulk_window, state="readonly", width=40)
+        game_dropdown.grid(row=0, column=1)
+        game_dropdown.bind("<<ComboboxSelected>>", on_game_selected)
+
+        team_game_var = tk.BooleanVar()
+        tk.Checkbutton(bulk_window, text="Team Game", variable=team_game_var, state="disabled").grid(row=0, column=2)
+
+        tk.Label(bulk_window, text="Team/Player:").grid(row=1, column=0, sticky="w")
+        team_or_player_dropdown = ttk.Combobox(bulk_window, width=40)
+        team_or_player_dropdown.grid(row=1, column=1)
+
+        tk.Label(bulk_window, text="Points:").grid(row=2, column=0, sticky="w")
+        points_input = tk.Entry(bulk_window)
+        points_input.grid(row=2, column=1, sticky="w")
+
+        tk.Label(bulk_window, text="Comment:").grid(row=3, column=0, sticky="w")
+        comment_input = tk.Entry(bulk_window, width=43)
+        comment_input.grid(row=3, column=1, sticky="w")
+
+        tk.Button(bulk_window, text="Stage (Enter)", command=stage_score).grid(row=4, column=0, columnspan=2)
+        for widget in (team_or_player_dropdown, points_input, comment_input):
+            widget.bind("<Return>", stage_score)
+
+        staging_table = ttk.Treeview(bulk_window, columns=("Game", "Team/Player", "Points", "Comment"), show="headings", height=12)
+        for column in ("Game", "Team/Player", "Points", "Comment"):
+            staging_table.heading(column, text=column)
+        staging_table.grid(row=5, column=0, columnspan=3, sticky="nsew")
+
+        status_label = tk.Label(bulk_window, text="0 scores staged")
+        status_label.grid(row=6, column=0, sticky="w")
+        tk.Button(bulk_window, text="Remove Selected", command=remove_staged).grid(row=6, column=1)
+        commit_btn = tk.Button(bulk_window, text="Commit All", command=commit_scores)
+        commit_btn.grid(row=6, column=2)
+
+        def populate_games(games):
+            games_by_name.update((game[1], (game[0], game[2])) for game in games)
+            game_dropdown["values"] = [game[1] for game in games]
+        self.with_reference("games", populate_games, bulk_window)
+        self.with_reference("teams", lambda rows: valid_ids["teams"].update(row[0] for row in rows), bulk_window)
+        self.with_reference("players", lambda rows: valid_ids["players"].update(row[0] for row in rows), bulk_window)
+
+    def export_rows(self, title, export):
+        """Ask for a .csv/.parquet path and stream rows into it in the background with export(path)."""
+        path = filedialog.asksaveasfilename(
+            parent=self, title=title, defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Parquet", "*.parquet")]
+        )
+        if not path:
+            return
+
+        def done(count):
+            messagebox.showinfo("Export Finished", f"Wrote {count} rows to {path}")
+
+        self.run_background(None, lambda: export(path), done)
+
+    def export_teams(self):
+        """Export the Teams view (honouring the competition filter)."""
+        competition_id = self.selected_competition_id
+        self.export_rows("Export Teams", lambda path: self.repo.export_teams(path, competition_id))
+
+    def export_scores(self):
+        """Export the Scores view (honouring the competition filter) without loading it into memory."""
+        competition_id = self.selected_competition_id
+        self.export_rows("Export Scores", lambda path: self.repo.export_scores(path, competition_id))
+
+    def import_data(self):
+        """Import teams, games, players or scores from a CSV/JSON file in the background."""
+        def browse():
+            path = filedialog.askopenfilename(
+                parent=import_window,
+                filetypes=[("CSV or JSON", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")]
+            )
+            if path:
+                path_var.set(path)
+
+        def run_import():
+            kind = kind_dropdown.get()
+            path = path_var.get()
+            if not kind or not path:
+                messagebox.showwarning("Input Error", "Choose what to import and a file.", parent=import_window)
+                return
+
+            def done(result):
+                self.reference_cache.invalidate()
+                self.score_analytics.invalidate()
+                self.fetch_all_data()
+                if result.inserted:
+                    self.repo.notify(kind, "insert")
+                details = "\n".join(f"Line {number}: {reason}" for number, reason in result.rejected[:20])
+                if len(result.rejected) > 20:
+                    details += f"\n... and {len(result.rejected) - 20} more"
+                messagebox.showinfo("Import Finished", result.summary() + ("\n\n" + details if details else ""))
+
+            if import_window.winfo_exists():
+                import_window.destroy()
+            self.executor.submit(None, lambda: import_file(self.db_credentials, kind, path), done, self.show_db_error)
+
+        import_window = tk.Toplevel(self)
+        import_window.title("Import Data")
+
+        tk.Label(import_window, text="Import:").grid(row=0, column=0, sticky="w")
+        kind_dropdown = ttk.Combobox(import_window, state="readonly", values=sorted(IMPORT_KINDS))
+        kind_dropdown.grid(row=0, column=1, sticky="w")
+        kind_dropdown.bind("<<ComboboxSelected>>", lambda event: columns_label.config(
+            text="Columns: " + ", ".join(IMPORT_KINDS[kind_dropdown.get()][1])
+        ))
+
+        tk.Label(import_window, text="File:").grid(row=1, column=0, sticky="w")
+        path_var = tk.StringVar()
+        tk.Entry(import_window, textvariable=path_var, width=40).grid(row=1, column=1)
+        tk.Button(import_window, text="Browse...", command=browse).grid(row=1, column=2)
+
+        columns_label = tk.Label(import_window, text="Columns: (choose what to import)")
+        columns_label.grid(row=2, column=0, columnspan=3)
+        tk.Button(import_window, text="Import", command=run_import).grid(row=3, column=0, columnspan=3)
+
     def add_game(self):
         """Add a new game to the database."""
         def submit_game():
@@ -761,26 +1499,16 @@ class CompetitionDBApp(tk.Tk):
                 messagebox.showwarning("Input Error", "Competition and Game Name are required.")
                 return
 
-            conn = connect_db(self.db_credentials)
-            if conn is None:
+            comp_id = competition_ids.get(comp_name)
+            if comp_id is None:
+                messagebox.showerror("Input Error", "Invalid competition selected.")
                 return
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM competitions WHERE name = %s", (comp_name,))
-                comp_id = cursor.fetchone()
-                if not comp_id:
-                    messagebox.showerror("Input Error", "Invalid competition selected.")
-                    return
-                cursor.execute(
-                    "INSERT INTO games (comp_id, name, team_game, date_played, created_at) VALUES (%s, %s, %s, %s, NOW())",
-                    (comp_id[0], name, team_game, date_played)
-                )
-                conn.commit()
-                conn.close()
-                game_window.destroy()
-                self.fetch_games()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+
+            def saved():
+                self.reference_cache.invalidate("games")
+                self.sync_tab("games")
+                self.fetch_dashboard()
+            self.submit_write(game_window, lambda key: self.repo.add_game(comp_id, name, team_game, date_played), saved)
 
         game_window = tk.Toplevel(self)
         game_window.title("Add Game")
@@ -789,13 +1517,14 @@ class CompetitionDBApp(tk.Tk):
         comp_dropdown = ttk.Combobox(game_window, state="readonly")
         comp_dropdown.grid(row=0, column=1)
 
-        conn = connect_db(self.db_credentials)
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM competitions")
-            competitions = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            comp_dropdown["values"] = competitions
+        competition_ids = {}  # Competition name -> id, from the reference rows (first wins for duplicate names)
+
+        def populate(competitions):
+            competition_ids.clear()
+            for comp in reversed(competitions):
+                competition_ids[comp[1]] = comp[0]
+            comp_dropdown["values"] = [comp[1] for comp in competitions]
+        self.with_reference("competitions", populate, game_window)
 
         tk.Label(game_window, text="Game Name:").grid(row=1, column=0, sticky="w")
         name_input = tk.Entry(game_window)
@@ -821,23 +1550,17 @@ class CompetitionDBApp(tk.Tk):
                 messagebox.showwarning("Input Error", "Team and Player Name are required.")
                 return
 
-            conn = connect_db(self.db_credentials)
-            if conn is None:
+            team_id = team_ids.get(team_name)
+            if team_id is None:
+                messagebox.showerror("Input Error", "Invalid team selected.")
                 return
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM teams WHERE name = %s", (team_name,))
-                team_id = cursor.fetchone()
-                if not team_id:
-                    messagebox.showerror("Input Error", "Invalid team selected.")
-                    return
-                cursor.execute("INSERT INTO players (team_id, name, created_at) VALUES (%s, %s, NOW())", (team_id[0], player_name))
-                conn.commit()
-                conn.close()
-                player_window.destroy()
-                self.fetch_players()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+
+            def saved():
+                self.reference_cache.invalidate("players")
+                self.sync_tab("players")
+                self.fetch_dashboard()
+            self.submit_write(player_window, lambda key: self.repo.add_player(team_id, player_name, key), saved,
+                              "player", (team_id, player_name))
 
         player_window = tk.Toplevel(self)
         player_window.title("Add Player")
@@ -846,13 +1569,14 @@ class CompetitionDBApp(tk.Tk):
         team_dropdown = ttk.Combobox(player_window, state="readonly")
         team_dropdown.grid(row=0, column=1)
 
-        conn = connect_db(self.db_credentials)
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM teams")
-            teams = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            team_dropdown["values"] = teams
+        team_ids = {}  # Team name -> id, from the reference rows (first team wins for duplicate names)
+
+        def populate(teams):
+            team_ids.clear()
+            for team in reversed(teams):
+                team_ids[team[1]] = team[0]
+            team_dropdown["values"] = [team[1] for team in teams]
+        self.with_reference("teams", populate, player_window)
 
         tk.Label(player_window, text="Player Name:").grid(row=1, column=0, sticky="w")
         player_name_input = tk.Entry(player_window)
@@ -872,22 +1596,12 @@ class CompetitionDBApp(tk.Tk):
                 messagebox.showwarning("Input Error", "All fields are required.")
                 return
 
-            conn = connect_db(self.db_credentials)
-            if conn is None:
-                return
-            try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO competitions (name, start_date, end_date, created_at) VALUES (%s, %s, %s, NOW())",
-                    (name, start_date, end_date)
-                )
-                conn.commit()
-                conn.close()
-                competition_window.destroy()
+            def saved():
+                self.reference_cache.invalidate("competitions")
                 self.refresh_competition_list()  # Refresh the competition list
-                self.fetch_competitions()
-            except mysql.connector.Error as e:
-                messagebox.showerror("Database Error", str(e))
+                self.sync_tab("competitions")
+            self.submit_write(competition_window, lambda key: self.repo.add_competition(name, start_date, end_date),
+                              saved)
 
         competition_window = tk.Toplevel(self)
         competition_window.title("Add Competition")
@@ -908,6 +1622,8 @@ class CompetitionDBApp(tk.Tk):
         submit_btn.grid(row=3, column=0, columnspan=2)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    get_profiler().enable_log()  # Rolling query_log.jsonl next to the app
     while True:  # Keep showing the login dialog until valid credentials are provided or the user cancels
         login_dialog = LoginDialog(None)  # Pass None as the parent for the dialog
         if login_dialog.credentials:
@@ -0,0 +1,286 @@
+import argparse
+import csv
+import getpass
+import json
+import re
+import time
+import mysql.connector
+from db_pool import get_pool
+from diagnostics import profiled
+import leaderboard
+from repository import GAME_INSERT, PLAYER_INSERT, PLAYER_SCORE_INSERT, TEAM_INSERT, TEAM_SCORE_INSERT
+
+CHUNK_SIZE = 1000  # Rows validated and inserted per transaction
+JSON_BLOCK_SIZE = 65536  # Characters of a JSON array file read at a time
+WHITESPACE = re.compile(r"\s*")
+VALUE_END = ",] \t\r\n"  # Characters that may follow a complete element of an array
+
+# Insert statement and expected input columns for each kind of import
+IMPORT_KINDS = {
+    "teams": (TEAM_INSERT, ("name", "competition")),
+    "games": (GAME_INSERT, ("competition", "name", "team_game", "date_played")),
+    "players": (PLAYER_INSERT, ("team", "name")),
+    "scores": (
+        None,  # Routed to team_scores_log or player_scores_log per row
+        ("game", "team", "player", "points", "comment"),
+    ),
+}
+
+class RowError(ValueError):
+    """Raised for an input row that cannot be imported."""
+
+class ImportResult:
+    """Counts and rejected rows from one import run."""
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.rejected = []  # (line number, reason)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"{self.inserted} of {self.read} rows imported, {len(self.rejected)} rejected "
+                f"in {self.elapsed:.1f}s ({self.rows_per_second:.0f} rows/s)")
+
+def iter_json_array(f, block_size=JSON_BLOCK_SIZE):
+    """Yield the elements of the JSON array in f one at a time, reading the file in blocks.
+
+    Raises ValueError (json.JSONDecodeError for bad syntax) where the file stops
+    being a valid array; the elements before that have already been yielded.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    expect = "open"  # "open" ([), "first" (element or ]), "element", "separator" (, or ])
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if expect == "open":
+                if char != "[":
+                    raise ValueError("a .json file must hold an array of rows")
+                pos, expect = pos + 1, "first"
+                continue
+            if char == "]" and expect in ("first", "separator"):
+                return
+            if expect == "separator":
+                if char != ",":
+                    raise ValueError(f"expected ',' or ']' but found {char!r}")
+                pos, expect = pos + 1, "element"
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value ending at the buffer's end may continue in the next block, and a number may
+                # stop early inside one ("1." of "1.5e10"): only trust a number followed by a delimiter
+                if eof or end < len(buffer) and (buffer[pos] in '{["' or buffer[end] in VALUE_END):
+                    yield value
+                    pos, expect = end, "separator"
+                    continue
+        elif eof:
+            raise ValueError("the JSON array is not closed")
+        block = f.read(block_size)
+        eof = not block
+        buffer, pos = buffer[pos:] + block, 0
+
+def read_rows(path):
+    """Yield (line number, row dict) from a CSV, JSON Lines or JSON array file.
+
+    JSON arrays are numbered by element. A line or element that is not valid
+    JSON is yielded as a RowError in place of the row; in a JSON array that
+    ends the file, since the parser cannot tell where the next element starts.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except ValueError as e:
+                        row = RowError(f"malformed JSON: {e}")
+                    yield number, row
+    elif path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            number = 0
+            try:
+                for number, row in enumerate(iter_json_array(f), start=1):
+                    yield number, row
+            except ValueError as e:
+                yield number + 1, RowError(f"malformed JSON, rest of the file skipped: {e}")
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            for number, row in enumerate(csv.DictReader(f), start=2):  # Line 1 is the header
+                yield number, row
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def prefetch_ids(cursor, table, extra_column=None):
+    """Map names (and ids, as strings) to rows for one dimension table in a single query."""
+    columns = "id, name" + (f", {extra_column}" if extra_column else "")
+    cursor.execute(f"SELECT {columns} FROM {table} ORDER BY id")
+    lookup = {}
+    for row in cursor.fetchall():
+        lookup.setdefault(str(row[1]), row)  # First row wins for duplicate names, like the dialogs
+        lookup[str(row[0])] = row
+    return lookup
+
+def parse_bool(value):
+    text = str(value or "").strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return 1
+    if text in ("", "0", "false", "no", "n"):
+        return 0
+    raise RowError(f"team_game must be yes/no, got {value!r}")
+
+def resolve(lookup, value, label):
+    row = lookup.get(str(value or "").strip())
+    if row is None:
+        raise RowError(f"unknown {label} {value!r}")
+    return row
+
+def build_row(kind, row, lookups):
+    """Turn one input row into (insert statement, parameters), raising RowError if it is invalid."""
+    def field(name, required=True):
+        value = row.get(name)
+        value = "" if value is None else str(value).strip()
+        if required and not value:
+            raise RowError(f"missing {name}")
+        return value
+
+    if kind == "teams":
+        comp = resolve(lookups["competitions"], field("competition"), "competition")
+        return IMPORT_KINDS["teams"][0], (field("name"), comp[0])
+    if kind == "games":
+        comp = resolve(lookups["competitions"], field("competition"), "competition")
+        date_played = field("date_played", required=False) or None
+        return IMPORT_KINDS["games"][0], (comp[0], field("name"), parse_bool(row.get("team_game")), date_played)
+    if kind == "players":
+        team = resolve(lookups["teams"], field("team"), "team")
+        return IMPORT_KINDS["players"][0], (team[0], field("name"))
+
+    game = resolve(lookups["games"], field("game"), "game")
+    points = field("points")
+    try:
+        float(points)
+    except ValueError:
+        raise RowError(f"points must be a number, got {points!r}")
+    comment = field("comment", required=False)
+    if game[2]:  # team_game
+        team = resolve(lookups["teams"], field("team"), "team")
+        return TEAM_SCORE_INSERT, (team[0], game[0], points, comment)
+    player = resolve(lookups["players"], field("player"), "player")
+    return PLAYER_SCORE_INSERT, (player[0], game[0], points, comment)
+
+def record_leaderboard(cursor, statements):
+    """Keep the leaderboard summary table (if enabled) in step with imported scores."""
+    leaderboard.record_scores(
+        cursor,
+        team_rows=[values for _, values in statements.get(TEAM_SCORE_INSERT, [])],
+        player_rows=[values for _, values in statements.get(PLAYER_SCORE_INSERT, [])]
+    )
+
+def insert_chunk(conn, cursor, statements, result):
+    """Insert validated rows grouped by statement, falling back to row-by-row on failure."""
+    try:
+        for sql, params in statements.items():
+            cursor.executemany(sql, [values for _, values in params])
+        record_leaderboard(cursor, statements)
+        conn.commit()
+        result.inserted += sum(len(params) for params in statements.values())
+        return
+    except mysql.connector.Error:
+        conn.rollback()
+
+    # Something in the batch was refused by the server; isolate the offending rows
+    for sql, params in statements.items():
+        for number, values in params:
+            try:
+                cursor.execute(sql, values)
+                record_leaderboard(cursor, {sql: [(number, values)]})
+                conn.commit()
+                result.inserted += 1
+            except mysql.connector.Error as e:
+                conn.rollback()
+                result.rejected.append((number, str(e)))
+
+def import_file(credentials, kind, path, chunk_size=CHUNK_SIZE, on_progress=None):
+    """Stream a CSV/JSON file into the database in chunks and return an ImportResult.
+
+    Names are resolved against one prefetch per dimension table. Bad rows are
+    recorded in result.rejected and the rest of the file still goes in.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"unknown import kind {kind!r}")
+    result = ImportResult()
+    conn = get_pool(credentials).get_connection()
+    cursor = profiled(conn.cursor(), f"import {kind}")  # Shows up in the diagnostics window and query log
+    try:
+        lookups = {"competitions": prefetch_ids(cursor, "competitions")}
+        if kind in ("players", "scores"):
+            lookups["teams"] = prefetch_ids(cursor, "teams")
+        if kind == "scores":
+            lookups["games"] = prefetch_ids(cursor, "games", "team_game")
+            lookups["players"] = prefetch_ids(cursor, "players")
+
+        for chunk in chunked(read_rows(path), chunk_size):
+            statements = {}  # sql -> [(line number, params)]
+            for number, row in chunk:
+                result.read += 1
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    sql, params = build_row(kind, row, lookups)
+                except (RowError, AttributeError) as e:
+                    result.rejected.append((number, str(e)))
+                    continue
+                statements.setdefault(sql, []).append((number, params))
+            if statements:
+                insert_chunk(conn, cursor, statements, result)
+            result.elapsed = time.perf_counter() - result.started
+            if on_progress:
+                on_progress(result)
+    finally:
+        cursor.close()
+        conn.close()
+    result.elapsed = time.perf_counter() - result.started
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Import teams, games, players or scores from CSV/JSON.")
+    parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+    parser.add_argument("path", help="CSV (with header), JSON array or JSON Lines file")
+    parser.add_argument("--host", default="192.168.0.113")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    credentials = {
+        "host": args.host,
+        "port": args.port,
+        "user": args.user,
+        "password": getpass.getpass("Password: "),
+    }
+    result = import_file(credentials, args.kind, args.path, args.chunk_size,
+                         on_progress=lambda r: print(f"\r{r.inserted} rows ({r.rows_per_second:.0f} rows/s)", end=""))
+    print()
+    for number, reason in result.rejected:
+        print(f"line {number}: {reason}")
+    print(result.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import time
+from collections import OrderedDict
+
+SUMMARY_TABLE = "team_leaderboard"
+SUMMARY_CHECK_TTL = 60  # Seconds a leaderboard read trusts the cached "does the summary table exist" answer
+
+# Team points per game for one competition, with players' points credited to their team.
+# Teams without any scores still appear (with NULL game columns).
+LIVE_QUERY = """
+    SELECT teams.id, teams.name, scores.game_id, scores.game_name, scores.date_played, scores.points
+    FROM teams
+    LEFT JOIN (
+        SELECT COALESCE(score_facts.team_id, players.team_id) AS team_id,
+               games.id AS game_id, games.name AS game_name, games.date_played,
+               SUM(score_facts.points) AS points
+        FROM score_facts
+        LEFT JOIN players ON score_facts.player_id = players.id
+        JOIN games ON score_facts.game_id = games.id
+        WHERE score_facts.comp_id = %s
+        GROUP BY COALESCE(score_facts.team_id, players.team_id), games.id, games.name, games.date_played
+    ) AS scores ON scores.team_id = teams.id
+    WHERE teams.comp_id = %s
+"""
+
+# Same shape as LIVE_QUERY, read from the incrementally maintained summary table
+SUMMARY_QUERY = f"""
+    SELECT teams.id, teams.name, games.id, games.name, games.date_played, {SUMMARY_TABLE}.points
+    FROM teams
+    LEFT JOIN {SUMMARY_TABLE} ON {SUMMARY_TABLE}.team_id = teams.id
+    LEFT JOIN games ON {SUMMARY_TABLE}.game_id = games.id
+    WHERE teams.comp_id = %s
+"""
+
+SUMMARY_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+        comp_id INT NOT NULL,
+        team_id INT NOT NULL,
+        game_id INT NOT NULL,
+        points DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (team_id, game_id),
+        KEY idx_{SUMMARY_TABLE}_comp (comp_id, team_id)
+    )
+"""
+
+# Each statement adds (or, with negative points, removes) points for one team and game
+RECORD_TEAM_SCORE = f"""
+    INSERT INTO {SUMMARY_TABLE} (comp_id, team_id, game_id, points)
+    SELECT games.comp_id, %s, games.id, %s FROM games WHERE games.id = %s
+    ON DUPLICATE KEY UPDATE points = points + VALUES(points)
+"""
+RECORD_PLAYER_SCORE = f"""
+    INSERT INTO {SUMMARY_TABLE} (comp_id, team_id, game_id, points)
+    SELECT games.comp_id, players.team_id, games.id, %s
+    FROM players JOIN games ON games.id = %s
+    WHERE players.id = %s AND players.team_id IS NOT NULL
+    ON DUPLICATE KEY UPDATE points = points + VALUES(points)
+"""
+UNRECORD_SCORE = f"""
+    INSERT INTO {SUMMARY_TABLE} (comp_id, team_id, game_id, points)
+    SELECT score_facts.comp_id, COALESCE(score_facts.team_id, players.team_id), score_facts.game_id, -score_facts.points
+    FROM score_facts
+    LEFT JOIN players ON score_facts.player_id = players.id
+    WHERE score_facts.id = %s AND COALESCE(score_facts.team_id, players.team_id) IS NOT NULL
+    ON DUPLICATE KEY UPDATE points = points + VALUES(points)
+"""
+
+_summary_state = {"exists": None, "checked_at": 0.0}
+
+def summary_enabled(cursor, max_age=0):
+    """Return True if the summary table exists; every writer then keeps it up to date.
+
+    Writers check inside their own transaction (max_age=0): another desk may have
+    enabled the summary a moment ago, and a score that skipped it would leave it
+    wrong for good. Its rebuild reads score_facts with shared locks, so it waits
+    for a writer that checked before the table existed to commit and then counts
+    that writer's scores. Readers may pass max_age and reuse a recent answer;
+    the live query gives the same leaderboard.
+    """
+    if max_age and time.monotonic() - _summary_state["checked_at"] < max_age:
+        return _summary_state["exists"]
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (SUMMARY_TABLE,)
+    )
+    _summary_state["exists"] = cursor.fetchone()[0] > 0
+    _summary_state["checked_at"] = time.monotonic()
+    return _summary_state["exists"]
+
+def enable_summary(cursor):
+    """Create the summary table and fill it from the score logs."""
+    cursor.execute(SUMMARY_DDL)
+    rebuild_summary(cursor)
+    _summary_state.update(exists=True, checked_at=time.monotonic())
+
+def rebuild_summary(cursor):
+    """Recompute every summary row from score_facts (the caller commits)."""
+    cursor.execute(f"DELETE FROM {SUMMARY_TABLE}")
+    cursor.execute(f"""
+        INSERT INTO {SUMMARY_TABLE} (comp_id, team_id, game_id, points)
+        SELECT score_facts.comp_id, COALESCE(score_facts.team_id, players.team_id), score_facts.game_id,
+               SUM(score_facts.points)
+        FROM score_facts
+        LEFT JOIN players ON score_facts.player_id = players.id
+        WHERE COALESCE(score_facts.team_id, players.team_id) IS NOT NULL
+        GROUP BY score_facts.comp_id, COALESCE(score_facts.team_id, players.team_id), score_facts.game_id
+    """)
+
+def record_scores(cursor, team_rows=(), player_rows=()):
+    """Add newly inserted scores to the summary table, if it is enabled.
+
+    Rows are the (id, game_id, points, ...) tuples used for the score log inserts;
+    run this in the same transaction as those inserts.
+    """
+    if not (team_rows or player_rows) or not summary_enabled(cursor):
+        return
+    if team_rows:
+        cursor.executemany(RECORD_TEAM_SCORE, [(row[0], row[2], row[1]) for row in team_rows])
+    if player_rows:
+        cursor.executemany(RECORD_PLAYER_SCORE, [(row[2], row[1], row[0]) for row in player_rows])
+
+def unrecord_score(cursor, score_id):
+    """Take a score that is about to be deleted out of the summary table, if it is enabled."""
+    if summary_enabled(cursor):
+        cursor.execute(UNRECORD_SCORE, (score_id,))
+
+def unrecord_scores(cursor, source, condition, params):
+    """Take every score matched by FROM source WHERE condition out of the summary table in one
+    statement, if it is enabled. source is score_facts joined to players (see repository.CASCADE_FROM)."""
+    if not summary_enabled(cursor):
+        return
+    cursor.execute(f"""
+        INSERT INTO {SUMMARY_TABLE} (comp_id, team_id, game_id, points)
+        SELECT score_facts.comp_id, COALESCE(score_facts.team_id, players.team_id), score_facts.game_id,
+               -SUM(score_facts.points)
+        FROM {source}
+        WHERE {condition} AND COALESCE(score_facts.team_id, players.team_id) IS NOT NULL
+        GROUP BY score_facts.comp_id, COALESCE(score_facts.team_id, players.team_id), score_facts.game_id
+        ON DUPLICATE KEY UPDATE points = points + VALUES(points)
+    """, params)
+
+def drop_orphans(cursor):
+    """Delete summary rows whose team or game no longer exists, if the summary is enabled."""
+    if summary_enabled(cursor):
+        cursor.execute(f"""
+            DELETE {SUMMARY_TABLE} FROM {SUMMARY_TABLE}
+            LEFT JOIN teams ON {SUMMARY_TABLE}.team_id = teams.id
+            LEFT JOIN games ON {SUMMARY_TABLE}.game_id = games.id
+            WHERE teams.id IS NULL OR games.id IS NULL
+        """)
+
+def fetch_leaderboard(cursor, competition_id, use_summary=None):
+    """Return (game names, ranked rows) for a competition.
+
+    Each ranked row is (rank, team name, total, points per game...). The summary
+    table is used when it exists unless use_summary says otherwise.
+    """
+    if use_summary is None:
+        use_summary = summary_enabled(cursor, SUMMARY_CHECK_TTL)
+    if use_summary:
+        cursor.execute(SUMMARY_QUERY, (competition_id,))
+    else:
+        cursor.execute(LIVE_QUERY, (competition_id, competition_id))
+    return rank_rows(cursor.fetchall())
+
+def rank_rows(rows):
+    """Pivot (team, game, points) rows into per-team totals with a per-game breakdown and rank."""
+    games = {}  # game id -> (date_played, name)
+    teams = OrderedDict()  # team id -> [name, {game id: points}]
+    for team_id, team_name, game_id, game_name, date_played, points in rows:
+        team = teams.setdefault(team_id, [team_name, {}])
+        if game_id is not None:
+            games[game_id] = (date_played, game_name)
+            team[1][game_id] = team[1].get(game_id, 0) + (points or 0)
+
+    game_ids = sorted(games, key=lambda game_id: (games[game_id][0] is None, games[game_id][0] or "", game_id))
+    totals = sorted(
+        ((sum(points.values()), name, points) for name, points in teams.values()),
+        key=lambda entry: entry[0], reverse=True
+    )
+
+    ranked = []
+    rank = 0
+    previous_total = None
+    for position, (total, name, points) in enumerate(totals, start=1):
+        if total != previous_total:  # Ties share a rank ("1, 1, 3")
+            rank, previous_total = position, total
+        ranked.append((rank, name, total) + tuple(points.get(game_id, 0) for game_id in game_ids))
+    return [games[game_id][1] for game_id in game_ids], ranked
@@ -0,0 +1,170 @@
+from contextlib import nullcontext
+
+PAGE_SIZE = 200  # Rows fetched per keyset page
+MAX_PAGES = 3  # Pages kept materialized in the Treeview at once
+EDGE_FRACTION = 0.05  # How close to the top/bottom the view must get before the next page loads
+
+class PagedTreeview:
+    """Shows a sliding window of a large, keyset-paged query in a Treeview.
+
+    Only a few pages of rows exist as Treeview items at any time. Scrolling near
+    the bottom fetches the page after the last row's id and scrolling near the
+    top fetches the one before the first row's id; pages falling out of the
+    window are removed. Rows are loaded through the app's QueryExecutor, and the
+    Treeview item id of every row is the database id.
+    """
+    def __init__(self, table, scrollbar, executor, key, on_status=None, on_error=None,
+                 page_size=PAGE_SIZE, max_pages=MAX_PAGES, profiler=None):
+        self.table = table
+        self.scrollbar = scrollbar
+        self.executor = executor
+        self.key = key
+        self.on_status = on_status  # Called with a "Showing x-y of n" string
+        self.on_error = on_error
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.profiler = profiler  # Optional diagnostics.QueryProfiler timing each page insert
+        self.load_page = None
+        self.count_rows = None
+        self.total = None
+        self.offset = 0  # Rows that exist before the first materialized row
+        self.loading = False
+        self.at_start = True
+        self.at_end = False
+        self.primed = False  # Rows from reset(initial_rows=...) are on screen until the first page replaces them
+
+        self.table.configure(yscrollcommand=self.on_yscroll)
+        self.scrollbar.configure(command=self.table.yview)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Up>", "<Down>", "<Prior>", "<Next>"):
+            self.table.bind(sequence, lambda event: self.table.after_idle(self.check_edges), add="+")
+
+    def reset(self, load_page, count_rows, initial_rows=None):
+        """Start over with a new query.
+
+        load_page(after_id, before_id, limit) and count_rows() run on a worker
+        thread; load_page returns rows whose first value is the row id, in
+        the query's order (ascending id unless the query sorts otherwise).
+        initial_rows in the same shape (e.g. saved from a previous session)
+        are shown until the first page has been fetched.
+        """
+        self.load_page = load_page
+        self.count_rows = count_rows
+        self.total = None
+        self.offset = 0
+        self.at_start = True
+        self.at_end = False
+        self.table.delete(*self.table.get_children())
+        self.primed = bool(initial_rows)
+        if initial_rows:
+            self.splice(initial_rows, prepend=False)
+        self.update_status()
+
+        self.executor.submit(self.key + "_count", count_rows, self.on_count, self.on_error)
+        self.request_page(after_id=None, before_id=None)
+
+    def request_page(self, after_id, before_id):
+        """Fetch one page in the background and splice it into the window."""
+        self.loading = True
+        load_page, limit = self.load_page, self.page_size
+        self.executor.submit(
+            self.key,
+            lambda: load_page(after_id, before_id, limit),
+            lambda rows: self.on_page(rows, prepend=before_id is not None),
+            self.on_page_error
+        )
+
+    def on_page_error(self, error):
+        self.loading = False
+        if self.on_error:
+            self.on_error(error)
+
+    def on_count(self, total):
+        self.total = total
+        self.update_status()
+
+    def on_page(self, rows, prepend):
+        """Insert a fetched page at one end of the window and trim the other end."""
+        self.loading = False
+        if self.primed:
+            self.primed = False
+            self.table.delete(*self.table.get_children())
+        with self.profiler.ui_timer(self.key, len(rows)) if self.profiler else nullcontext():
+            self.splice(rows, prepend)
+        self.update_status()
+
+    def splice(self, rows, prepend):
+        children = self.table.get_children()
+        anchor = self.table.identify_row(0) if children else ""
+
+        if prepend:
+            self.at_start = len(rows) < self.page_size
+            for row in reversed(rows):
+                if not self.table.exists(str(row[0])):
+                    self.table.insert("", 0, iid=str(row[0]), values=row[1:])
+            self.offset = max(self.offset - len(rows), 0)
+            overflow = len(self.table.get_children()) - self.page_size * self.max_pages
+            if overflow > 0:
+                self.table.delete(*self.table.get_children()[-overflow:])
+                self.at_end = False
+        else:
+            self.at_end = len(rows) < self.page_size
+            for row in rows:
+                if not self.table.exists(str(row[0])):
+                    self.table.insert("", "end", iid=str(row[0]), values=row[1:])
+            overflow = len(self.table.get_children()) - self.page_size * self.max_pages
+            if overflow > 0:
+                self.table.delete(*self.table.get_children()[:overflow])
+                self.offset += overflow
+                self.at_start = False
+
+        # Keep the row the user was looking at in place after the window shifted
+        if anchor and self.table.exists(anchor):
+            children = self.table.get_children()
+            self.table.yview_moveto(self.table.index(anchor) / max(len(children), 1))
+
+    def on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.check_edges()
+
+    def check_edges(self):
+        """Load the neighbouring page when the view reaches either end of the window."""
+        if self.loading or self.load_page is None:
+            return
+        children = self.table.get_children()
+        if not children:
+            return
+        first, last = self.table.yview()
+        if last >= 1 - EDGE_FRACTION and not self.at_end:
+            self.request_page(after_id=int(children[-1]), before_id=None)
+        elif first <= EDGE_FRACTION and not self.at_start:
+            self.request_page(after_id=None, before_id=int(children[0]))
+
+    def refresh_tail(self):
+        """Pick up rows added since the last load (new ids sort last unless another sort is active)."""
+        if self.load_page is None:
+            return
+        if self.at_end:
+            children = self.table.get_children()
+            self.request_page(after_id=int(children[-1]) if children else None, before_id=None)
+        # The window may not reach the end, so only the count needs to change
+        self.executor.submit(self.key + "_count", self.count_rows, self.on_count, self.on_error)
+
+    def remove(self, row_id):
+        """Drop a single row from the window (e.g. after it was deleted)."""
+        iid = str(row_id)
+        if self.table.exists(iid):
+            self.table.delete(iid)
+            if self.total:
+                self.total -= 1
+            self.update_status()
+
+    def update_status(self):
+        if self.on_status is None:
+            return
+        shown = len(self.table.get_children())
+        if self.total is None:
+            self.on_status(f"Showing {shown} rows (counting...)")
+        elif shown == 0:
+            self.on_status(f"0 of {self.total} rows")
+        else:
+            self.on_status(f"Showing {self.offset + 1}-{self.offset + shown} of {self.total} rows")
@@ -0,0 +1,60 @@
+PICKER_DELAY_MS = 150  # Pause in typing before the choices are looked up
+PICKER_LIMIT = 20  # Choices offered at once; typing more of the name narrows them
+
+class TypeaheadPicker:
+    """Turns an editable Combobox into an incremental-search picker.
+
+    As the user types, search(prefix) runs on the app's QueryExecutor and the
+    rows it returns become the dropdown choices, so only a screenful of names
+    is ever loaded. Rows are (id, ...) tuples and format_choice(row) is the text
+    shown for each. A newer lookup supersedes one still in flight.
+    """
+    def __init__(self, combobox, executor, key, format_choice, on_error=None, delay_ms=PICKER_DELAY_MS):
+        self.combobox = combobox
+        self.executor = executor
+        self.key = key
+        self.format_choice = format_choice
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.search = None
+        self.choices = {}  # Choice text -> row
+        self.pending = None  # after() id of the scheduled lookup
+
+        self.combobox.configure(state="normal")
+        self.combobox.bind("<KeyRelease>", self.on_key, add="+")
+        self.combobox.bind("<Destroy>", self.on_destroy, add="+")
+
+    def set_search(self, search):
+        """Start over with a new lookup (e.g. for another game's competition) and offer its first names."""
+        self.search = search
+        self.combobox.set("")
+        self.lookup()
+
+    def on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Tab", "Escape") or self.combobox.get() in self.choices:
+            return  # Navigating the list or a choice was just picked
+        if self.pending is not None:
+            self.combobox.after_cancel(self.pending)
+        self.pending = self.combobox.after(self.delay_ms, self.lookup)
+
+    def on_destroy(self, event):
+        if self.pending is not None:  # The dialog was closed before the lookup ran
+            self.combobox.after_cancel(self.pending)
+            self.pending = None
+
+    def lookup(self):
+        self.pending = None
+        if self.search is None:
+            return
+        search, prefix = self.search, self.combobox.get().strip()
+        self.executor.submit(self.key, lambda: search(prefix), self.on_results, self.on_error)
+
+    def on_results(self, rows):
+        if not self.combobox.winfo_exists():
+            return  # The dialog was closed meanwhile
+        self.choices = {self.format_choice(row): row for row in rows}
+        self.combobox["values"] = list(self.choices)
+
+    def selected(self):
+        """The row of the chosen entry, or None if the text is not one of the choices."""
+        return self.choices.get(self.combobox.get())
@@ -0,0 +1,96 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class QueryExecutor:
+    """Runs database work on worker threads and delivers results on the Tk thread.
+
+    Every job is submitted under a key (e.g. "teams"). Submitting a new job for a
+    key supersedes the previous one: if the old job has not started it is skipped,
+    and if it already ran its result is dropped instead of being applied to the UI.
+    """
+    def __init__(self, root, workers=4, poll_ms=30, on_busy=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy  # Called as on_busy(key, busy) on the Tk thread
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+        self._results = queue.Queue()
+        self._generations = {}  # key -> generation of the most recent submission
+        self._pending = {}  # key -> number of jobs not yet delivered
+        self._lock = threading.Lock()
+        self._closed = False
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, key, func, on_success=None, on_error=None):
+        """Run func() in the background and pass its result to on_success on the Tk thread.
+
+        A key of None marks the job as not cancellable (used for writes).
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self._pending[key] = self._pending.get(key, 0) + 1
+            became_busy = self._pending[key] == 1
+        if became_busy and key is not None and self.on_busy:
+            self.on_busy(key, True)
+
+        def run():
+            if not self._is_current(key, generation):
+                return None  # Superseded before it started; skip the round trip
+            return func()
+
+        future = self._workers.submit(run)
+        future.add_done_callback(
+            lambda f: self._results.put((key, generation, f, on_success, on_error))
+        )
+
+    def cancel(self, *keys):
+        """Discard queued or in-flight jobs for the given keys."""
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def is_busy(self, key):
+        """Return True while a job for this key is still outstanding."""
+        with self._lock:
+            return self._pending.get(key, 0) > 0
+
+    def _is_current(self, key, generation):
+        if key is None:
+            return True
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _poll(self):
+        """Drain finished jobs and run their callbacks on the Tk thread."""
+        if self._closed:
+            return
+        self.root.after(self.poll_ms, self._poll)  # Reschedule first so a failing callback can't stop polling
+
+        while True:
+            try:
+                key, generation, future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._pending[key] -= 1
+                now_idle = self._pending[key] == 0
+            current = self._is_current(key, generation)
+
+            try:
+                if current:
+                    error = future.exception()
+                    if error is not None:
+                        if on_error:
+                            on_error(error)
+                    elif on_success:
+                        on_success(future.result())
+            finally:
+                if now_idle and key is not None and self.on_busy:
+                    self.on_busy(key, False)
+
+    def shutdown(self):
+        """Stop polling and let running jobs finish without delivering results."""
+        self._closed = True
+        self._workers.shutdown(wait=False, cancel_futures=True)
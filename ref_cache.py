@@ -0,0 +1,73 @@
+import threading
+import time
+from db_pool import DATABASE_NAME, get_pool
+from diagnostics import profiled
+from repository import REFERENCE_QUERIES
+
+CACHE_TTL = 300  # Seconds before cached rows are re-read (picks up changes made by other desks)
+
+class ReferenceCache:
+    """Process-wide cache of the competitions, teams, games and players lookups."""
+    def __init__(self, credentials, ttl=CACHE_TTL):
+        self.credentials = credentials
+        self.ttl = ttl
+        self._entries = {}  # table -> (rows, loaded_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, table, stale_ok=False):
+        """Return the cached rows for a table if they are still fresh (or, with stale_ok, at all), else None."""
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry and (stale_ok or time.monotonic() - entry[1] < self.ttl):
+                self.hits += 1
+                return entry[0]
+        return None
+
+    def get(self, table):
+        """Return the rows for a table, querying the database on a miss."""
+        rows = self.peek(table)
+        if rows is not None:
+            return rows
+
+        conn = get_pool(self.credentials).get_connection()
+        try:
+            cursor = profiled(conn.cursor(), f"reference {table}")
+            cursor.execute(REFERENCE_QUERIES[table])
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[table] = (rows, time.monotonic())
+        return rows
+
+    def seed(self, table, rows):
+        """Preload rows from elsewhere (e.g. a saved snapshot) as already expired.
+
+        peek(stale_ok=True) returns them at once, while get() still re-reads the table.
+        """
+        with self._lock:
+            if table not in self._entries:
+                self._entries[table] = (rows, float("-inf"))
+
+    def invalidate(self, *tables):
+        """Forget cached rows after the app itself changed these tables."""
+        with self._lock:
+            for table in tables or list(self._entries):
+                self._entries.pop(table, None)
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_reference_cache(credentials):
+    """Return the shared reference cache for these credentials and their database (see db_pool.get_pool)."""
+    key = (credentials["host"], credentials["port"], credentials["user"], credentials.get("database", DATABASE_NAME))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ReferenceCache(credentials)
+        return cache
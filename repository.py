@@ -0,0 +1,620 @@
+from contextlib import contextmanager
+import re
+import mysql.connector
+import analytics
+from columnar import ColumnarRows
+import dashboard
+from db_pool import get_pool
+from diagnostics import profiled
+from exporter import export_query
+import leaderboard
+
+# Query behind each id-keyed tab: (base SELECT, competition filter column, id column).
+# The first selected column is always the row id, which is also used as the Treeview item id.
+TAB_QUERIES = {
+    "teams": ("""
+        SELECT teams.id, teams.name, competitions.name AS competition_name, teams.score
+        FROM teams
+        JOIN competitions ON teams.comp_id = competitions.id
+    """, "teams.comp_id", "teams.id"),
+    "games": ("""
+        SELECT games.id, competitions.name AS competition_name, games.name,
+               games.team_game, games.date_played, games.created_at
+        FROM games
+        JOIN competitions ON games.comp_id = competitions.id
+    """, "games.comp_id", "games.id"),
+    "players": ("""
+        SELECT players.id, teams.name AS team_name, players.name AS player_name, players.created_at
+        FROM players
+        LEFT JOIN teams ON players.team_id = teams.id
+    """, "teams.comp_id", "players.id"),
+    "competitions": ("""
+        SELECT id, name, start_date, end_date, created_at
+        FROM competitions
+    """, None, "id"),
+}
+# The small dimension tables used to fill dropdowns and resolve names to ids (see ref_cache.py)
+REFERENCE_QUERIES = {
+    "competitions": "SELECT id, name FROM competitions ORDER BY id",
+    "teams": "SELECT id, name, comp_id FROM teams ORDER BY id",
+    "games": "SELECT id, name, team_game, comp_id FROM games ORDER BY id",
+    "players": """
+        SELECT players.id, players.name, teams.name AS team_name, players.team_id
+        FROM players
+        LEFT JOIN teams ON players.team_id = teams.id
+        ORDER BY players.id
+    """,
+}
+# SQL expression behind each Treeview column of a tab, in display order, for server-side sorting
+TAB_SORT_COLUMNS = {
+    "teams": ["teams.id", "teams.name", "competitions.name", "teams.score"],
+    "games": ["games.id", "competitions.name", "games.name", "games.team_game", "games.date_played", "games.created_at"],
+    "players": ["players.id", "teams.name", "players.name", "players.created_at"],
+    "competitions": ["id", "name", "start_date", "end_date", "created_at"],
+}
+# Column the search box matches for each tab (word starts; FULLTEXT-indexed from schema version 5)
+TAB_SEARCH_COLUMNS = {
+    "teams": "teams.name",
+    "games": "games.name",
+    "players": "players.name",
+    "competitions": "name",
+}
+FULLTEXT_MIN_WORD = 3  # InnoDB's default innodb_ft_min_token_size; shorter words are matched with REGEXP
+# InnoDB's default FULLTEXT stopwords: the index has no entries for them, so they are matched with REGEXP too
+FULLTEXT_STOPWORDS = {
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how", "i", "in",
+    "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+}
+
+# Score rows shown in the Scores tab and used for exports. score_facts (see schema.py) carries
+# comp_id itself, so one competition's page is a range scan on (comp_id, id).
+SCORES_FROM = """
+    FROM score_facts
+    LEFT JOIN teams ON score_facts.team_id = teams.id
+    LEFT JOIN players ON score_facts.player_id = players.id
+    JOIN games ON score_facts.game_id = games.id
+    JOIN competitions ON score_facts.comp_id = competitions.id
+"""
+SCORES_QUERY = """
+    SELECT
+        score_facts.id,
+        COALESCE(teams.name, 'N/A') AS team_name,
+        COALESCE(players.name, 'N/A') AS player_name,
+        games.name AS game_name,
+        competitions.name AS competition_name,
+        score_facts.points,
+        score_facts.comment
+""" + SCORES_FROM
+# Sort expression for each Scores Treeview column (the id is not shown); none of them can be NULL
+SCORE_SORT_COLUMNS = [
+    "COALESCE(teams.name, 'N/A')", "COALESCE(players.name, 'N/A')", "games.name",
+    "competitions.name", "score_facts.points", "COALESCE(score_facts.comment, '')",
+]
+SCORES_HEADERS = ["ID", "Team Name", "Player Name", "Game Name", "Competition Name", "Points", "Comment"]
+TEAMS_HEADERS = ["ID", "Name", "Competition Name", "Score"]
+
+TEAM_INSERT = "INSERT INTO teams (name, comp_id, created_at, score) VALUES (%s, %s, NOW(), 0)"
+GAME_INSERT = "INSERT INTO games (comp_id, name, team_game, date_played, created_at) VALUES (%s, %s, %s, %s, NOW())"
+PLAYER_INSERT = "INSERT INTO players (team_id, name, created_at) VALUES (%s, %s, NOW())"
+COMPETITION_INSERT = "INSERT INTO competitions (name, start_date, end_date, created_at) VALUES (%s, %s, %s, NOW())"
+TEAM_SCORE_INSERT = "INSERT INTO team_scores_log (team_id, game_id, points, comment, created_at) VALUES (%s, %s, %s, %s, NOW())"
+PLAYER_SCORE_INSERT = "INSERT INTO player_scores_log (player_id, game_id, points, comment, created_at) VALUES (%s, %s, %s, %s, NOW())"
+APPLIED_WRITE_INSERT = "INSERT INTO applied_writes (idempotency_key) VALUES (%s)"
+
+# What a cascade delete of one row removes. "scope" gives the condition selecting the affected rows
+# of each table (every %s is the deleted row's id) in the FROM clauses of CASCADE_FROM; tables a
+# scope leaves out are untouched. "deletes" are the set-based statements, children first.
+CASCADE_FROM = {
+    "teams": "teams",
+    "players": "players LEFT JOIN teams ON players.team_id = teams.id",
+    "games": "games",
+    "scores": "score_facts LEFT JOIN players ON score_facts.player_id = players.id",
+}
+CASCADES = {
+    "competitions": {
+        "scope": {
+            "teams": "teams.comp_id = %s",
+            "players": "teams.comp_id = %s",
+            "games": "games.comp_id = %s",
+            "scores": "score_facts.comp_id = %s",
+        },
+        "deletes": [
+            "DELETE FROM score_facts WHERE comp_id = %s",
+            "DELETE team_scores_log FROM team_scores_log JOIN games ON team_scores_log.game_id = games.id WHERE games.comp_id = %s",
+            "DELETE player_scores_log FROM player_scores_log JOIN games ON player_scores_log.game_id = games.id WHERE games.comp_id = %s",
+            "DELETE players FROM players JOIN teams ON players.team_id = teams.id WHERE teams.comp_id = %s",
+            "DELETE FROM teams WHERE comp_id = %s",
+            "DELETE FROM games WHERE comp_id = %s",
+            "DELETE FROM competitions WHERE id = %s",
+        ],
+    },
+    "teams": {
+        "scope": {
+            "teams": "teams.id = %s",
+            "players": "players.team_id = %s",
+            "scores": "(score_facts.team_id = %s OR players.team_id = %s)",
+        },
+        "deletes": [
+            "DELETE FROM score_facts WHERE team_id = %s",
+            "DELETE score_facts FROM score_facts JOIN players ON score_facts.player_id = players.id WHERE players.team_id = %s",
+            "DELETE FROM team_scores_log WHERE team_id = %s",
+            "DELETE player_scores_log FROM player_scores_log JOIN players ON player_scores_log.player_id = players.id WHERE players.team_id = %s",
+            "DELETE FROM players WHERE team_id = %s",
+            "DELETE FROM teams WHERE id = %s",
+        ],
+    },
+    "games": {
+        "scope": {
+            "games": "games.id = %s",
+            "scores": "score_facts.game_id = %s",
+        },
+        "deletes": [
+            "DELETE FROM score_facts WHERE game_id = %s",
+            "DELETE FROM team_scores_log WHERE game_id = %s",
+            "DELETE FROM player_scores_log WHERE game_id = %s",
+            "DELETE FROM games WHERE id = %s",
+        ],
+    },
+    "players": {
+        "scope": {
+            "players": "players.id = %s",
+            "scores": "score_facts.player_id = %s",
+        },
+        "deletes": [
+            "DELETE FROM score_facts WHERE player_id = %s",
+            "DELETE FROM player_scores_log WHERE player_id = %s",
+            "DELETE FROM players WHERE id = %s",
+        ],
+    },
+}
+
+def where(conditions):
+    return "WHERE " + " AND ".join(conditions) if conditions else ""
+
+def prefix_condition(column, prefix):
+    """(sql, params) matching rows whose column starts with prefix: a range scan on an index on column."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{column} LIKE %s", [escaped + "%"]
+
+def search_condition(column, term, fulltext=False):
+    """(sql, params) matching rows whose name column matches every word of term.
+
+    Each search is anchored by an indexed predicate so it never scans the whole
+    table. With the FULLTEXT indexes (schema version 5), words the index holds
+    find names with a word starting with them ("smi" finds "John Smith").
+    Otherwise, or when every word is too short or a stopword, the first word
+    must start the name and is matched by a LIKE range scan ("jo smi" finds
+    "John Smith", "smi" does not). The remaining words are checked with a
+    REGEXP on word starts, only on the rows the index found. A term without
+    any word characters is a plain prefix match.
+    """
+    words = re.findall(r"\w+", term)
+    if not words:
+        return prefix_condition(column, term)
+    indexed = [word for word in words if len(word) >= FULLTEXT_MIN_WORD
+               and word.lower() not in FULLTEXT_STOPWORDS] if fulltext else []
+    conditions, params = [], []
+    if indexed:
+        conditions.append(f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)")
+        params.append(" ".join(f"+{word}*" for word in indexed))
+        residual = [word for word in words if word not in indexed]
+    else:
+        condition, prefix_params = prefix_condition(column, words[0])
+        conditions.append(condition)
+        params += prefix_params
+        residual = words[1:]
+    for word in residual:
+        conditions.append(f"{column} REGEXP %s")
+        params.append(f"(^|[^[:alnum:]_]){word}")
+    return "(" + " AND ".join(conditions) + ")", params
+
+class CompetitionRepository:
+    """Every read and write the front ends make, with no UI code.
+
+    Methods check a connection out of the shared pool for each call, so they are
+    safe to run from worker threads. Database errors are raised to the caller.
+    Every statement is timed by the diagnostics profiler under a short label.
+    If a change feed is given, committed writes are published to the other desks.
+    """
+    def __init__(self, credentials, feed=None):
+        self.credentials = credentials
+        self.feed = feed  # Optional change_feed.ChangeFeed
+        self._fulltext = None  # Whether the FULLTEXT name indexes exist, checked on first search
+
+    def notify(self, table, op, ids=(), comp_id=None):
+        """Publish a committed change (call only after the transaction has been committed)."""
+        if self.feed is not None:
+            self.feed.publish(table, op, ids, comp_id)
+
+    def _checkout(self, label, raw=False):
+        """Check out a pooled connection and return (connection, profiled cursor, statements used).
+
+        cursor.prepared(sql) gives the connection's server-side prepared statement
+        for sql (see db_pool.StatementCache), profiled under the same label.
+        A raw cursor returns the server's text bytes without type conversion.
+        """
+        conn = get_pool(self.credentials).get_connection()
+        cursor = profiled(conn.cursor(raw=raw), label)
+        statements = {}
+
+        def prepared(sql):
+            if sql not in statements:
+                statements[sql] = profiled(conn.prepared(sql), label)
+            return statements[sql]
+        cursor.prepared = prepared
+        return conn, cursor, statements
+
+    @staticmethod
+    def _release(conn, cursor, statements):
+        for statement in statements.values():
+            statement.finish()  # Not closed: prepared statements stay open in the pool for reuse
+        cursor.finish()
+        conn.close()
+
+    @contextmanager
+    def cursor(self, label, raw=False):
+        """Yield a profiled cursor on a pooled connection; the connection is returned when the block ends."""
+        conn, cursor, statements = self._checkout(label, raw)
+        try:
+            yield cursor
+        finally:
+            self._release(conn, cursor, statements)
+
+    @contextmanager
+    def transaction(self, label):
+        """Like cursor(), but commit if the block succeeds and roll back if it raises."""
+        conn, cursor, statements = self._checkout(label)
+        try:
+            yield cursor
+            conn.commit()
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn, cursor, statements)
+
+    def query(self, label, sql, params=(), prepared=False):
+        """Run one SELECT and return its rows; prepared=True reuses a server-side prepared statement."""
+        with self.cursor(label) as cursor:
+            statement = cursor.prepared(sql) if prepared else cursor
+            statement.execute(sql, params)
+            return statement.fetchall()
+
+    def execute(self, label, sql, params=(), idempotency_key=None):
+        """Run one write statement and commit it; returns the new row id for inserts.
+
+        An idempotency key is recorded in applied_writes in the same transaction,
+        so a copy of the write queued after a lost connection is not applied again.
+        """
+        with self.transaction(label) as cursor:
+            cursor.execute(sql, params)
+            row_id = cursor.lastrowid
+            if idempotency_key is not None:
+                cursor.execute(APPLIED_WRITE_INSERT, (idempotency_key,))
+            return row_id
+
+    # Tab listings
+
+    def fulltext_search(self):
+        """Whether searches can use the FULLTEXT name indexes added in schema version 5."""
+        if self._fulltext is None:
+            rows = self.query("fulltext check", """
+                SELECT COUNT(DISTINCT table_name) FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND index_type = 'FULLTEXT' AND column_name = 'name'
+                  AND table_name IN ('teams', 'games', 'players', 'competitions')
+            """)
+            self._fulltext = rows[0][0] == 4
+        return self._fulltext
+
+    def tab_query(self, key, competition_id=None, since_id=None, search=None, sort=None):
+        """Build the SELECT for a tab.
+
+        Honours a competition filter, an optional id high-water mark, a name
+        search and sort=(column index, descending) over the tab's columns.
+        """
+        sql, comp_column, id_column = TAB_QUERIES[key]
+        conditions, params = [], []
+        if comp_column and competition_id:
+            conditions.append(f"{comp_column} = %s")
+            params.append(competition_id)
+        if since_id is not None:
+            conditions.append(f"{id_column} > %s")
+            params.append(since_id)
+        if search:
+            condition, search_params = search_condition(TAB_SEARCH_COLUMNS[key], search, self.fulltext_search())
+            conditions.append(condition)
+            params.extend(search_params)
+        order = ""
+        if sort:
+            direction = "DESC" if sort[1] else "ASC"
+            order = f"ORDER BY {TAB_SORT_COLUMNS[key][sort[0]]} {direction}, {id_column} {direction}"
+        return f"{sql} {where(conditions)} {order}", tuple(params)
+
+    def tab_rows(self, key, competition_id=None, since_id=None, search=None, sort=None):
+        """Rows for the teams, games, players or competitions tab."""
+        sql, params = self.tab_query(key, competition_id, since_id, search, sort)
+        # Unsearched listings are a handful of fixed statements, so they are prepared once per connection
+        return self.query(key, sql, params, prepared=not search)
+
+    def tab_columns(self, key, competition_id=None, since_id=None, search=None, sort=None):
+        """Like tab_rows(), but decoded into columnar.ColumnarRows from a raw cursor (for large tab loads)."""
+        sql, params = self.tab_query(key, competition_id, since_id, search, sort)
+        with self.cursor(key, raw=True) as cursor:
+            cursor.execute(sql, params)
+            return ColumnarRows.fetch(cursor)
+
+    def existing_ids(self, table):
+        """Every id currently in teams, games, players or competitions (an index-only scan)."""
+        return [row[0] for row in self.query(f"{table} ids", f"SELECT id FROM {table}")]
+
+    # Scores
+
+    def score_conditions(self, competition_id=None, search=None):
+        """WHERE conditions on score_facts for a competition and a team, player or game name search."""
+        conditions, params = [], []
+        if competition_id:
+            conditions.append("score_facts.comp_id = %s")
+            params.append(competition_id)
+        if search:
+            # Resolve the names through their own indexes, then probe score_facts' foreign key indexes
+            condition, search_params = search_condition("name", search, self.fulltext_search())
+            conditions.append(f"""(score_facts.team_id IN (SELECT id FROM teams WHERE {condition})
+                OR score_facts.player_id IN (SELECT id FROM players WHERE {condition})
+                OR score_facts.game_id IN (SELECT id FROM games WHERE {condition}))""")
+            params.extend(search_params * 3)
+        return conditions, params
+
+    def score_page(self, competition_id=None, after_id=None, before_id=None, limit=200, search=None, sort=None):
+        """One keyset page of score rows, after after_id or ending just before before_id.
+
+        Rows are in id order, or ordered by sort=(column index, descending) with
+        the id breaking ties. The boundary row's sort value is looked up by its id,
+        so every page is still a seek rather than an OFFSET. If the boundary row
+        has been deleted meanwhile, its sort value is unknown, and the page
+        continues in id order from the boundary id instead of coming back empty.
+        """
+        conditions, params = self.score_conditions(competition_id, search)
+        column, descending = (SCORE_SORT_COLUMNS[sort[0]], sort[1]) if sort else (None, False)
+        backwards = before_id is not None
+        boundary = before_id if backwards else after_id
+        op = ">" if descending == backwards else "<"
+        with self.cursor("scores page") as cursor:
+            if boundary is not None and column is not None:
+                sql = f"SELECT {column} {SCORES_FROM} WHERE score_facts.id = %s"
+                statement = cursor.prepared(sql)
+                statement.execute(sql, (boundary,))
+                found = statement.fetchall()
+                if found:
+                    conditions.append(f"({column} {op} %s OR ({column} = %s AND score_facts.id {op} %s))")
+                    params.extend([found[0][0], found[0][0], boundary])
+                else:
+                    column = None  # Boundary row deleted: page by id alone
+            if boundary is not None and column is None:
+                conditions.append(f"score_facts.id {op} %s")
+                params.append(boundary)
+            direction = "DESC" if descending != backwards else "ASC"
+            order = f"{column} {direction}, score_facts.id {direction}" if column else f"score_facts.id {direction}"
+            params.append(limit)
+            sql = f"""{SCORES_QUERY}
+                {where(conditions)}
+                ORDER BY {order}
+                LIMIT %s
+            """
+            statement = cursor if search else cursor.prepared(sql)
+            statement.execute(sql, params)
+            rows = statement.fetchall()
+        return rows[::-1] if backwards else rows
+
+    def count_scores(self, competition_id=None, search=None):
+        conditions, params = self.score_conditions(competition_id, search)
+        sql = f"SELECT COUNT(*) FROM score_facts {where(conditions)}"
+        return self.query("scores count", sql, params, prepared=not search)[0][0]
+
+    def scores_query(self, competition_id=None):
+        """(sql, params) for every score row in id order, for streaming exports."""
+        if competition_id:
+            return SCORES_QUERY + " WHERE score_facts.comp_id = %s ORDER BY score_facts.id", (competition_id,)
+        return SCORES_QUERY + " ORDER BY score_facts.id", ()
+
+    def add_scores(self, team_rows=(), player_rows=(), idempotency_key=None):
+        """Insert (entity id, game id, points, comment) rows into the score logs in one transaction.
+
+        idempotency_key is recorded with them, as in execute().
+        """
+        with self.transaction("add scores") as cursor:
+            for sql, rows in ((TEAM_SCORE_INSERT, team_rows), (PLAYER_SCORE_INSERT, player_rows)):
+                if len(rows) == 1:
+                    cursor.prepared(sql).execute(sql, rows[0])  # Single scores skip the parse
+                elif rows:
+                    cursor.executemany(sql, rows)  # Sent as one multi-row INSERT
+            leaderboard.record_scores(cursor, team_rows, player_rows)
+            if idempotency_key is not None:
+                cursor.execute(APPLIED_WRITE_INSERT, (idempotency_key,))
+        self.notify("scores", "insert")  # New ids sort last; receivers fetch past their high-water mark
+
+    def add_score(self, is_team_game, entity_id, game_id, points, comment, idempotency_key=None):
+        score = (entity_id, game_id, points, comment)
+        if is_team_game:
+            self.add_scores(team_rows=[score], idempotency_key=idempotency_key)
+        else:
+            self.add_scores(player_rows=[score], idempotency_key=idempotency_key)
+
+    def delete_score(self, score_id):
+        """Delete a score through the log it came from; returns its competition id, or None if it was already gone."""
+        with self.transaction("delete score") as cursor:
+            cursor.execute("SELECT source, source_id, comp_id FROM score_facts WHERE id = %s", (score_id,))
+            fact = cursor.fetchone()
+            if fact is None:
+                return None  # Already deleted (e.g. from another desk)
+            leaderboard.unrecord_score(cursor, score_id)
+            # Delete from the log the score came from; its trigger removes the fact row
+            log_table = "team_scores_log" if fact[0] == "team" else "player_scores_log"
+            cursor.execute(f"DELETE FROM {log_table} WHERE id = %s", (fact[1],))
+        self.notify("scores", "delete", [score_id], fact[2])
+        return fact[2]
+
+    def apply_queued(self, writes):
+        """Apply (idempotency key, kind, params) writes from an offline queue in one transaction.
+
+        Kinds are "team" (name, competition id), "player" (team id, name) and
+        "score" (is team game, team/player id, game id, points, comment). Keys
+        already recorded in applied_writes are skipped, so re-sending a batch is
+        harmless. Returns {kind: number of writes applied}.
+        """
+        with self.transaction("replay queued writes") as cursor:
+            keys = [key for key, _, _ in writes]
+            cursor.execute(
+                f"SELECT idempotency_key FROM applied_writes WHERE idempotency_key IN ({', '.join(['%s'] * len(keys))})",
+                keys
+            )
+            done = {row[0] for row in cursor.fetchall()}
+
+            statements = {}  # sql -> [params], in first-seen order
+            team_scores, player_scores = [], []
+            applied = {}
+            for key, kind, params in writes:
+                if key in done:
+                    continue
+                if kind == "score":
+                    score = tuple(params[1:])
+                    (team_scores if params[0] else player_scores).append(score)
+                    statements.setdefault(TEAM_SCORE_INSERT if params[0] else PLAYER_SCORE_INSERT, []).append(score)
+                else:
+                    statements.setdefault(TEAM_INSERT if kind == "team" else PLAYER_INSERT, []).append(tuple(params))
+                applied[kind] = applied.get(kind, 0) + 1
+            for sql, rows in statements.items():
+                cursor.executemany(sql, rows)
+            leaderboard.record_scores(cursor, team_scores, player_scores)
+            fresh = [(key,) for key, _, _ in writes if key not in done]
+            if fresh:
+                cursor.executemany(APPLIED_WRITE_INSERT, fresh)
+        for kind in applied:
+            self.notify(kind + "s", "insert")
+        return applied
+
+    # Teams, games, players and competitions
+
+    def name_matches(self, table, prefix, competition_id, limit=20):
+        """Up to limit teams ((id, name)) or players ((id, name, team name)) of a competition
+        whose name starts with prefix, in name order. Served by the (comp_id, name) and
+        (team_id, name) indexes from schema version 6."""
+        if table == "teams":
+            condition, params = prefix_condition("name", prefix)
+            sql = f"SELECT id, name FROM teams WHERE comp_id = %s AND {condition} ORDER BY name, id LIMIT %s"
+        else:
+            condition, params = prefix_condition("players.name", prefix)
+            sql = f"""
+                SELECT players.id, players.name, teams.name
+                FROM teams
+                JOIN players ON players.team_id = teams.id
+                WHERE teams.comp_id = %s AND {condition}
+                ORDER BY players.name, players.id
+                LIMIT %s
+            """
+        return self.query(f"{table} picker", sql, [competition_id] + params + [limit])
+
+    def id_by_name(self, table, name):
+        """Id of the first row in teams, games or competitions with this name, or None."""
+        rows = self.query(f"{table} by name", f"SELECT id FROM {table} WHERE name = %s LIMIT 1", (name,), prepared=True)
+        return rows[0][0] if rows else None
+
+    def add_team(self, name, competition_id, idempotency_key=None):
+        team_id = self.execute("add team", TEAM_INSERT, (name, competition_id), idempotency_key)
+        self.notify("teams", "insert", [team_id], competition_id)
+        return team_id
+
+    def add_game(self, competition_id, name, team_game, date_played):
+        game_id = self.execute("add game", GAME_INSERT, (competition_id, name, team_game, date_played))
+        self.notify("games", "insert", [game_id], competition_id)
+        return game_id
+
+    def add_player(self, team_id, name, idempotency_key=None):
+        player_id = self.execute("add player", PLAYER_INSERT, (team_id, name), idempotency_key)
+        self.notify("players", "insert", [player_id])
+        return player_id
+
+    def add_competition(self, name, start_date, end_date):
+        competition_id = self.execute("add competition", COMPETITION_INSERT, (name, start_date, end_date))
+        self.notify("competitions", "insert", [competition_id])
+        return competition_id
+
+    def deletion_impact(self, table, row_id):
+        """{"competitions"/"teams"/"players"/"games"/"scores": rows} a cascade delete of one
+        competition, team, game or player would remove, counted in one query."""
+        cascade = CASCADES[table]
+        keys, counts, params = [], [], []
+        for key in ("teams", "players", "games", "scores"):
+            condition = cascade["scope"].get(key)
+            if condition:
+                keys.append(key)
+                counts.append(f"(SELECT COUNT(*) FROM {CASCADE_FROM[key]} WHERE {condition})")
+                params.extend([row_id] * condition.count("%s"))
+        with self.cursor(f"{table} delete impact") as cursor:
+            cursor.execute("SELECT " + ", ".join(counts), params)
+            impact = dict(zip(keys, cursor.fetchone()))
+        if table == "competitions":
+            impact = {"competitions": 1, **impact}
+        return impact
+
+    def cascade_delete(self, table, row_id):
+        """Delete a competition, team, game or player and everything that depends on it.
+
+        Runs set-based DELETEs in dependency order in one transaction, keeping the
+        leaderboard summary in step. Returns {table: deleted ids} for teams, players,
+        games and competitions, plus "scores": number of score rows deleted.
+        """
+        cascade = CASCADES[table]
+        deleted = {table: [int(row_id)]} if table == "competitions" else {}
+        with self.transaction(f"delete {table}") as cursor:
+            # Ids of the listed rows going away, so every desk can drop them without reloading
+            for key in ("teams", "players", "games"):
+                condition = cascade["scope"].get(key)
+                if condition:
+                    cursor.execute(f"SELECT {key}.id FROM {CASCADE_FROM[key]} WHERE {condition}",
+                                   [row_id] * condition.count("%s"))
+                    deleted[key] = [row[0] for row in cursor.fetchall()]
+            scores = cascade["scope"]["scores"]
+            leaderboard.unrecord_scores(cursor, CASCADE_FROM["scores"], scores, [row_id] * scores.count("%s"))
+            deleted["scores"] = 0
+            for sql in cascade["deletes"]:
+                cursor.execute(sql, [row_id] * sql.count("%s"))
+                if sql.startswith(("DELETE FROM score_facts", "DELETE score_facts")):
+                    deleted["scores"] += cursor.rowcount
+            leaderboard.drop_orphans(cursor)
+        for key, ids in deleted.items():
+            if key != "scores" and ids:
+                self.notify(key, "delete", ids)
+        if deleted["scores"]:
+            self.notify("scores", "delete")  # Too many to list; other desks reload their Scores tab
+        return deleted
+
+    # Leaderboard and exports
+
+    def leaderboard(self, competition_id):
+        """(game names, ranked rows) for a competition; see leaderboard.fetch_leaderboard."""
+        with self.cursor("leaderboard") as cursor:
+            return leaderboard.fetch_leaderboard(cursor, competition_id)
+
+    def dashboard(self, competition_id, since_id=0):
+        """Overview rows for a competition in one round trip; see dashboard.FIGURES_QUERY."""
+        with self.cursor("dashboard") as cursor:
+            return dashboard.fetch_figures(cursor.prepared(dashboard.FIGURES_QUERY), competition_id, since_id)
+
+    def score_frame(self, competition_id):
+        """A competition's score log as a pandas DataFrame; see analytics.load_frame."""
+        with self.cursor("score analytics") as cursor:
+            return analytics.load_frame(cursor, competition_id)
+
+    def enable_leaderboard_summary(self):
+        with self.transaction("enable summary") as cursor:
+            leaderboard.enable_summary(cursor)
+
+    def export_teams(self, path, competition_id=None):
+        sql, params = self.tab_query("teams", competition_id)
+        return export_query(self.credentials, sql, params, TEAMS_HEADERS, path)
+
+    def export_scores(self, path, competition_id=None):
+        """Stream the score rows to a .csv/.parquet file without loading them into memory."""
+        sql, params = self.scores_query(competition_id)
+        return export_query(self.credentials, sql, params, SCORES_HEADERS, path)
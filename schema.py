@@ -0,0 +1,383 @@
+import argparse
+import getpass
+import mysql.connector
+from db_pool import DATABASE_NAME
+from repository import TAB_QUERIES, SCORES_QUERY
+
+TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS competitions (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        start_date DATE,
+        end_date DATE,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS teams (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        comp_id INT NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        score INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (comp_id) REFERENCES competitions (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS games (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        comp_id INT NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        team_game BOOLEAN NOT NULL DEFAULT FALSE,
+        date_played DATE,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (comp_id) REFERENCES competitions (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS players (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        team_id INT,
+        name VARCHAR(255) NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (team_id) REFERENCES teams (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS team_scores_log (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        team_id INT NOT NULL,
+        game_id INT NOT NULL,
+        points DECIMAL(12, 2) NOT NULL,
+        comment VARCHAR(255),
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (team_id) REFERENCES teams (id) ON DELETE CASCADE,
+        FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_scores_log (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        player_id INT NOT NULL,
+        game_id INT NOT NULL,
+        points DECIMAL(12, 2) NOT NULL,
+        comment VARCHAR(255),
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (player_id) REFERENCES players (id) ON DELETE CASCADE,
+        FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE
+    )
+    """,
+]
+
+# total_scores_log is what the app reads and deletes from; when we create it ourselves it is
+# filled by triggers on the two per-kind logs the app inserts into.
+TOTAL_SCORES_TABLE = """
+    CREATE TABLE total_scores_log (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        team_id INT,
+        player_id INT,
+        game_id INT NOT NULL,
+        points DECIMAL(12, 2) NOT NULL,
+        comment VARCHAR(255),
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (team_id) REFERENCES teams (id) ON DELETE CASCADE,
+        FOREIGN KEY (player_id) REFERENCES players (id) ON DELETE CASCADE,
+        FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE
+    )
+"""
+TOTAL_SCORES_TRIGGERS = [
+    """
+    CREATE TRIGGER team_scores_log_to_total AFTER INSERT ON team_scores_log FOR EACH ROW
+        INSERT INTO total_scores_log (team_id, game_id, points, comment, created_at)
+        VALUES (NEW.team_id, NEW.game_id, NEW.points, NEW.comment, NEW.created_at)
+    """,
+    """
+    CREATE TRIGGER player_scores_log_to_total AFTER INSERT ON player_scores_log FOR EACH ROW
+        INSERT INTO total_scores_log (player_id, game_id, points, comment, created_at)
+        VALUES (NEW.player_id, NEW.game_id, NEW.points, NEW.comment, NEW.created_at)
+    """,
+]
+
+# (table, index name, columns) for the filters, joins and name lookups the app actually runs
+INDEXES = [
+    # Competition-filtered tab fetches; id last so "ORDER BY id" within a competition is index order
+    ("teams", "idx_teams_comp", "comp_id, id"),
+    ("games", "idx_games_comp", "comp_id, id"),
+    ("players", "idx_players_team", "team_id, id"),
+    # Name lookups in add_score/add_player/add_game (SELECT id ... WHERE name = %s)
+    ("teams", "idx_teams_name", "name, id"),
+    ("games", "idx_games_name", "name, id, team_game"),
+    ("competitions", "idx_competitions_name", "name, id"),
+    ("players", "idx_players_name", "name, id"),
+    # Score log joins; game_id first so one competition's games select contiguous id ranges.
+    # Only for a total_scores_log some other frontend created: ours is replaced by a view in version 3.
+    ("total_scores_log", "idx_total_scores_game", "game_id, id"),
+    ("total_scores_log", "idx_total_scores_team", "team_id"),
+    ("total_scores_log", "idx_total_scores_player", "player_id"),
+    ("team_scores_log", "idx_team_scores_team_game", "team_id, game_id"),
+    ("player_scores_log", "idx_player_scores_player_game", "player_id, game_id"),
+]
+
+def table_exists(cursor, table, table_type=None):
+    """Check for a table or view; pass table_type="BASE TABLE" or "VIEW" to require one kind."""
+    sql = "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s"
+    params = (table,)
+    if table_type:
+        sql += " AND table_type = %s"
+        params += (table_type,)
+    cursor.execute(sql, params)
+    return cursor.fetchone()[0] > 0
+
+def trigger_exists(cursor, trigger):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.triggers WHERE trigger_schema = DATABASE() AND trigger_name = %s",
+        (trigger,)
+    )
+    return cursor.fetchone()[0] > 0
+
+def index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, index)
+    )
+    return cursor.fetchone()[0] > 0
+
+def create_tables(cursor):
+    """Version 1: the tables the app uses (existing tables are left alone)."""
+    for ddl in TABLES:
+        cursor.execute(ddl)
+    if not table_exists(cursor, "total_scores_log"):
+        cursor.execute(TOTAL_SCORES_TABLE)
+        for ddl in TOTAL_SCORES_TRIGGERS:
+            cursor.execute(ddl)
+
+def create_indexes(cursor):
+    """Version 2: composite/covering indexes for the app's query shapes."""
+    replaced = trigger_exists(cursor, "team_scores_log_to_total")  # Version 1's table, dropped by version 3
+    for table, index, columns in INDEXES:
+        if table == "total_scores_log" and replaced:
+            continue
+        if table_exists(cursor, table, "BASE TABLE") and not index_exists(cursor, table, index):
+            cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+# One row per score from either log, with the competition copied in so the Scores tab for a
+# competition is a single range scan on (comp_id, id). Kept in step by triggers on the two logs;
+# the foreign keys cascade the deletes that bypass triggers (e.g. deleting a game).
+SCORE_FACTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS score_facts (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        source ENUM('team', 'player') NOT NULL,
+        source_id INT NOT NULL,
+        comp_id INT NOT NULL,
+        game_id INT NOT NULL,
+        team_id INT,
+        player_id INT,
+        points DECIMAL(12, 2) NOT NULL,
+        comment VARCHAR(255),
+        created_at DATETIME NOT NULL,
+        UNIQUE KEY uq_score_facts_source (source, source_id),
+        KEY idx_score_facts_comp (comp_id, id),
+        FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE,
+        FOREIGN KEY (team_id) REFERENCES teams (id) ON DELETE CASCADE,
+        FOREIGN KEY (player_id) REFERENCES players (id) ON DELETE CASCADE
+    )
+"""
+SCORE_FACTS_TRIGGERS = {
+    "team_scores_log_fact_insert": """
+        CREATE TRIGGER team_scores_log_fact_insert AFTER INSERT ON team_scores_log FOR EACH ROW
+            INSERT INTO score_facts (source, source_id, comp_id, game_id, team_id, points, comment, created_at)
+            SELECT 'team', NEW.id, games.comp_id, NEW.game_id, NEW.team_id, NEW.points, NEW.comment, NEW.created_at
+            FROM games WHERE games.id = NEW.game_id
+    """,
+    "team_scores_log_fact_delete": """
+        CREATE TRIGGER team_scores_log_fact_delete AFTER DELETE ON team_scores_log FOR EACH ROW
+            DELETE FROM score_facts WHERE source = 'team' AND source_id = OLD.id
+    """,
+    "player_scores_log_fact_insert": """
+        CREATE TRIGGER player_scores_log_fact_insert AFTER INSERT ON player_scores_log FOR EACH ROW
+            INSERT INTO score_facts (source, source_id, comp_id, game_id, player_id, points, comment, created_at)
+            SELECT 'player', NEW.id, games.comp_id, NEW.game_id, NEW.player_id, NEW.points, NEW.comment, NEW.created_at
+            FROM games WHERE games.id = NEW.game_id
+    """,
+    "player_scores_log_fact_delete": """
+        CREATE TRIGGER player_scores_log_fact_delete AFTER DELETE ON player_scores_log FOR EACH ROW
+            DELETE FROM score_facts WHERE source = 'player' AND source_id = OLD.id
+    """,
+}
+SCORE_FACTS_BACKFILL = [
+    """
+    INSERT IGNORE INTO score_facts (source, source_id, comp_id, game_id, team_id, points, comment, created_at)
+    SELECT 'team', team_scores_log.id, games.comp_id, team_scores_log.game_id, team_scores_log.team_id,
+           team_scores_log.points, team_scores_log.comment, team_scores_log.created_at
+    FROM team_scores_log JOIN games ON team_scores_log.game_id = games.id
+    ORDER BY team_scores_log.created_at, team_scores_log.id
+    """,
+    """
+    INSERT IGNORE INTO score_facts (source, source_id, comp_id, game_id, player_id, points, comment, created_at)
+    SELECT 'player', player_scores_log.id, games.comp_id, player_scores_log.game_id, player_scores_log.player_id,
+           player_scores_log.points, player_scores_log.comment, player_scores_log.created_at
+    FROM player_scores_log JOIN games ON player_scores_log.game_id = games.id
+    ORDER BY player_scores_log.created_at, player_scores_log.id
+    """,
+]
+# Readers that still use total_scores_log (e.g. other frontends) see the facts through a plain view
+TOTAL_SCORES_VIEW = """
+    CREATE VIEW total_scores_log AS
+    SELECT id, team_id, player_id, game_id, points, comment, created_at FROM score_facts
+"""
+
+def create_score_facts(cursor):
+    """Version 3: the trigger-maintained score fact table that the Scores tab reads."""
+    cursor.execute(SCORE_FACTS_TABLE)
+    for name, ddl in SCORE_FACTS_TRIGGERS.items():
+        if not trigger_exists(cursor, name):
+            cursor.execute(ddl)
+    for sql in SCORE_FACTS_BACKFILL:
+        cursor.execute(sql)
+
+    # If total_scores_log is the trigger-fed table created by version 1, replace it with the view
+    if trigger_exists(cursor, "team_scores_log_to_total"):
+        cursor.execute("DROP TRIGGER team_scores_log_to_total")
+        cursor.execute("DROP TRIGGER player_scores_log_to_total")
+        cursor.execute("DROP TABLE total_scores_log")
+        cursor.execute(TOTAL_SCORES_VIEW)
+
+# Idempotency keys of writes replayed from a desk's offline queue (see write_queue.py). The key is
+# inserted in the same transaction as the write, so a replay interrupted after commit is not applied twice.
+APPLIED_WRITES_TABLE = """
+    CREATE TABLE IF NOT EXISTS applied_writes (
+        idempotency_key CHAR(32) PRIMARY KEY,
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+def create_applied_writes(cursor):
+    """Version 4: idempotency keys for replayed offline writes."""
+    cursor.execute(APPLIED_WRITES_TABLE)
+
+# (table, index name) for the search boxes; word-prefix matches on name (see repository.search_condition)
+FULLTEXT_INDEXES = [
+    ("teams", "ft_teams_name"),
+    ("games", "ft_games_name"),
+    ("players", "ft_players_name"),
+    ("competitions", "ft_competitions_name"),
+]
+
+def create_fulltext_indexes(cursor):
+    """Version 5: FULLTEXT indexes on the name columns the search boxes match."""
+    for table, index in FULLTEXT_INDEXES:
+        if not index_exists(cursor, table, index):
+            cursor.execute(f"CREATE FULLTEXT INDEX {index} ON {table} (name)")
+
+# (table, index name, columns) for the typeahead pickers: name prefixes within one competition
+PICKER_INDEXES = [
+    ("teams", "idx_teams_comp_name", "comp_id, name"),
+    ("players", "idx_players_team_name", "team_id, name"),
+]
+
+def create_picker_indexes(cursor):
+    """Version 6: indexes for prefix lookups of a competition's teams and players."""
+    for table, index, columns in PICKER_INDEXES:
+        if not index_exists(cursor, table, index):
+            cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+# Ordered list of (version, description, step); steps must be safe to re-run
+MIGRATIONS = [
+    (1, "base tables", create_tables),
+    (2, "query indexes", create_indexes),
+    (3, "score fact table", create_score_facts),
+    (4, "offline write idempotency keys", create_applied_writes),
+    (5, "name search indexes", create_fulltext_indexes),
+    (6, "typeahead picker indexes", create_picker_indexes),
+]
+
+def current_version(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+def migrate(conn):
+    """Apply every migration newer than the database's recorded version; returns the versions applied."""
+    cursor = conn.cursor()
+    version = current_version(cursor)
+    applied = []
+    for number, description, step in MIGRATIONS:
+        if number <= version:
+            continue
+        step(cursor)  # DDL commits implicitly in MySQL, so steps are written to be re-runnable
+        cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)", (number, description))
+        conn.commit()
+        applied.append(number)
+    return applied
+
+def plan_checks():
+    """(label, sql, params, tables that must not be full-scanned) for the app's hot queries."""
+    checks = []
+    for key in ("teams", "games", "players"):
+        sql, comp_column, _ = TAB_QUERIES[key]
+        driving_table = comp_column.split(".")[0]
+        checks.append((f"{key} by competition", f"{sql} WHERE {comp_column} = %s", (1,), {driving_table, key}))
+    checks.append((
+        "scores page by competition",
+        SCORES_QUERY + " WHERE score_facts.comp_id = %s AND score_facts.id > %s ORDER BY score_facts.id LIMIT %s",
+        (1, 0, 200), {"score_facts"}
+    ))
+    checks.append(("game by name", "SELECT id FROM games WHERE name = %s", ("x",), {"games"}))
+    checks.append(("team by name", "SELECT id FROM teams WHERE name = %s", ("x",), {"teams"}))
+    checks.append(("competition by name", "SELECT id FROM competitions WHERE name = %s", ("x",), {"competitions"}))
+    checks.append((
+        "team picker", "SELECT id, name FROM teams WHERE comp_id = %s AND name LIKE %s ORDER BY name, id LIMIT 20",
+        (1, "x%"), {"teams"}
+    ))
+    checks.append(("player name prefix search", "SELECT id FROM players WHERE name LIKE %s", ("x%",), {"players"}))
+    return checks
+
+def verify_plans(conn):
+    """EXPLAIN each hot query and return a list of problems (full scans on tables that have an index)."""
+    cursor = conn.cursor(dictionary=True)
+    problems = []
+    for label, sql, params, indexed_tables in plan_checks():
+        cursor.execute("EXPLAIN " + sql, params)
+        for row in cursor.fetchall():
+            if row["table"] in indexed_tables and row["type"] == "ALL":
+                problems.append(f"{label}: full scan of {row['table']} (possible keys: {row['possible_keys']})")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the competition database schema.")
+    parser.add_argument("--host", default="192.168.0.113")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--check", action="store_true", help="EXPLAIN the app's queries after migrating")
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=getpass.getpass("Password: "),
+    )
+    try:
+        conn.cursor().execute(f"CREATE DATABASE IF NOT EXISTS {DATABASE_NAME}")
+        conn.database = DATABASE_NAME
+        applied = migrate(conn)
+        print(f"Applied migrations: {applied}" if applied else "Schema is up to date.")
+        if args.check:
+            problems = verify_plans(conn)
+            for problem in problems:
+                print(problem)
+            print("All query plans use indexes." if not problems else f"{len(problems)} plan problem(s).")
+            raise SystemExit(1 if problems else 0)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
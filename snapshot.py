@@ -0,0 +1,52 @@
+import json
+import sqlite3
+import time
+from db_pool import DATABASE_NAME
+
+SNAPSHOT_PATH = "snapshot.sqlite3"
+
+class LocalSnapshot:
+    """Last-seen tab contents, kept in a local SQLite file so the next start can render them at once.
+
+    Each entry is (rows, high-water id, total, saved_at) keyed by tab name, per
+    server and database. Rows are stored as displayed; the app reconciles them
+    with MySQL in the background after showing them.
+    """
+    def __init__(self, credentials, path=SNAPSHOT_PATH):
+        self.path = path
+        self.scope = f"{credentials['host']}:{credentials['port']}/{credentials.get('database', DATABASE_NAME)}"
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS tabs (
+                scope TEXT NOT NULL,
+                tab TEXT NOT NULL,
+                rows TEXT NOT NULL,
+                high_water INTEGER,
+                total INTEGER,
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (scope, tab)
+            )
+        """)
+        self._db.commit()
+
+    def load(self):
+        """{tab: (rows, high_water, total, saved_at)} from the last save for this database."""
+        cursor = self._db.execute(
+            "SELECT tab, rows, high_water, total, saved_at FROM tabs WHERE scope = ?", (self.scope,)
+        )
+        return {tab: (json.loads(rows), high_water, total, saved_at)
+                for tab, rows, high_water, total, saved_at in cursor}
+
+    def save(self, tabs):
+        """Replace the saved entries with {tab: (rows, high_water, total)} in one transaction."""
+        now = time.time()
+        with self._db:
+            self._db.execute("DELETE FROM tabs WHERE scope = ?", (self.scope,))
+            self._db.executemany(
+                "INSERT INTO tabs (scope, tab, rows, high_water, total, saved_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.scope, tab, json.dumps([list(row) for row in rows], default=str), high_water, total, now)
+                 for tab, (rows, high_water, total) in tabs.items()]
+            )
+
+    def close(self):
+        self._db.close()
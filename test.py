@@ -1,21 +1,138 @@
+import logging
+import threading
+import mysql.connector
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.properties import BooleanProperty, ListProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.tabbedpanel import TabbedPanel, TabbedPanelItem
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.label import Label
-from kivy.uix.gridlayout import GridLayout
-import mysql.connector
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from repository import CompetitionRepository, SCORES_HEADERS, TEAMS_HEADERS
 
 # Database Connection
-def connect_db():
-    return mysql.connector.connect(
-        host="192.168.0.113",
-        user="root",
-        password="yourpassword",
-        database="compDB",
-        port=3306
-    )
+DB_CREDENTIALS = {
+    "host": "192.168.0.113",
+    "user": "root",
+    "password": "yourpassword",
+    "port": 3306
+}
+repo = CompetitionRepository(DB_CREDENTIALS)
+log = logging.getLogger(__name__)
+
+ROW_HEIGHT = 30  # Every table row has the same height, so positions follow from the row count
+PAGE_SIZE = 200  # Rows fetched per keyset page
+LOAD_MORE_AT = 0.1  # Fetch the next page when the view is this close to the bottom (scroll_y fraction)
+
+class TableRow(BoxLayout):
+    """One row of a table: a Label per column whose texts are swapped when the row is recycled."""
+    values = ListProperty()
+    bold = BooleanProperty(False)
+
+    def on_values(self, instance, values):
+        while len(self.children) < len(values):
+            self.add_widget(Label(bold=self.bold))
+        for label, value in zip(reversed(self.children), values):
+            label.text = value
+
+    def on_bold(self, instance, bold):
+        for label in self.children:
+            label.bold = bold
+
+class RecycledTable(BoxLayout):
+    """A header row over a RecycleView that only creates widgets for the rows on screen.
+
+    Rows come from load_page(after_id, limit), which returns rows whose first
+    value is the id, in id order; the next page is fetched on a background
+    thread as the view nears the bottom.
+    """
+    def __init__(self, headers, **kwargs):
+        super().__init__(orientation="vertical", **kwargs)
+        self.column_count = len(headers)
+        self.add_widget(TableRow(values=headers, bold=True, size_hint_y=None, height=ROW_HEIGHT))
+
+        self.view = RecycleView(viewclass="TableRow")
+        layout = RecycleBoxLayout(
+            orientation="vertical", size_hint_y=None,
+            default_size=(None, ROW_HEIGHT), default_size_hint=(1, None)
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        self.view.add_widget(layout)
+        self.view.bind(scroll_y=lambda view, scroll_y: self.check_end())
+        self.add_widget(self.view)
+
+        self.load_page = None
+        self.generation = 0  # Bumped by reset() so pages of an earlier query are dropped
+        self.last_id = None
+        self.loading = False
+        self.at_end = True
+        self.has_status_row = False  # The last entry of view.data is an error message, not a row
+
+    def reset(self, load_page):
+        """Start over with a new query and fetch its first page."""
+        self.load_page = load_page
+        self.generation += 1
+        self.last_id = None
+        self.loading = False
+        self.at_end = False
+        self.has_status_row = False
+        self.view.data = []
+        self.view.scroll_y = 1
+        self.request_page()
+
+    def check_end(self):
+        if self.view.scroll_y <= LOAD_MORE_AT:
+            self.request_page()
+
+    def request_page(self):
+        if self.loading or self.at_end or self.load_page is None:
+            return
+        self.loading = True
+        load_page, after_id, generation = self.load_page, self.last_id, self.generation
+
+        def fetch():
+            try:
+                rows = load_page(after_id, PAGE_SIZE)
+            except mysql.connector.Error as e:
+                log.warning("Could not load rows: %s", e)
+                message = f"Could not load rows: {e} (scroll down to retry)"
+                Clock.schedule_once(lambda dt: self.on_page_error(generation, message))
+                return
+            Clock.schedule_once(lambda dt: self.on_page(rows, generation))
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def on_page_error(self, generation, message):
+        if generation != self.generation:
+            return
+        self.loading = False  # Scrolling to the bottom again retries
+        self.clear_status()
+        self.view.data.append({"values": [message] + [""] * (self.column_count - 1)})
+        self.has_status_row = True
+
+    def clear_status(self):
+        """Remove the error row shown at the end of the table, if any."""
+        if self.has_status_row:
+            self.view.data.pop()
+            self.has_status_row = False
+
+    def on_page(self, rows, generation):
+        if generation != self.generation:
+            return  # Arrived after a reset
+        self.loading = False
+        self.at_end = len(rows) < PAGE_SIZE
+        self.clear_status()
+        if not rows:
+            return
+        self.last_id = rows[-1][0]
+        # Keep the rows the user is looking at in place while the content grows
+        offset = (1 - self.view.scroll_y) * max(len(self.view.data) * ROW_HEIGHT - self.view.height, 0)
+        self.view.data.extend({"values": [str(value) for value in row]} for row in rows)
+        scrollable = len(self.view.data) * ROW_HEIGHT - self.view.height
+        if scrollable > 0:
+            self.view.scroll_y = 1 - offset / scrollable
 
 # Main Kivy UI
 class CompetitionDBApp(TabbedPanel):
@@ -40,9 +157,9 @@ class CompetitionDBApp(TabbedPanel):
         self.load_team_btn.bind(on_press=self.fetch_teams)
         self.teams_layout.add_widget(self.load_team_btn)
 
-        # Teams Display Grid
-        self.teams_grid = GridLayout(cols=4, size_hint=(1, 0.8))
-        self.teams_layout.add_widget(self.teams_grid)
+        # Teams Display Table
+        self.teams_table = RecycledTable(TEAMS_HEADERS, size_hint=(1, 0.8))
+        self.teams_layout.add_widget(self.teams_table)
 
         self.teams_tab.add_widget(self.teams_layout)
         self.add_widget(self.teams_tab)
@@ -56,60 +173,27 @@ class CompetitionDBApp(TabbedPanel):
         self.load_scores_btn.bind(on_press=self.fetch_scores)
         self.scores_layout.add_widget(self.load_scores_btn)
 
-        # Scores Display Grid
-        self.scores_grid = GridLayout(cols=6, size_hint=(1, 0.9))
-        self.scores_layout.add_widget(self.scores_grid)
+        # Scores Display Table
+        self.scores_table = RecycledTable(SCORES_HEADERS, size_hint=(1, 0.9))
+        self.scores_layout.add_widget(self.scores_table)
 
         self.scores_tab.add_widget(self.scores_layout)
         self.add_widget(self.scores_tab)
 
     def fetch_teams(self, instance):
-        self.teams_grid.clear_widgets()
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, comp_id, score FROM teams")
-        teams = cursor.fetchall()
-        conn.close()
-
-        # Add column headers
-        headers = ["ID", "Name", "Comp ID", "Score"]
-        for header in headers:
-            self.teams_grid.add_widget(Label(text=header, bold=True))
-
-        # Add team data
-        for team in teams:
-            for data in team:
-                self.teams_grid.add_widget(Label(text=str(data)))
+        # All teams past the last id, in id order (the list is short, so it comes in one go)
+        self.teams_table.reset(lambda after_id, limit: repo.tab_rows("teams", since_id=after_id, sort=(0, False)))
 
     def add_team(self, instance):
         team_name = self.team_input.text.strip()
         if not team_name:
             return
 
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO teams (name, comp_id, created_at, score) VALUES (%s, 1, NOW(), 0)", (team_name,))
-        conn.commit()
-        conn.close()
+        repo.add_team(team_name, 1)
         self.fetch_teams(instance)
 
     def fetch_scores(self, instance):
-        self.scores_grid.clear_widgets()
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT team_id, player_id, game_id, points, created_at, comment FROM total_scores_log")
-        scores = cursor.fetchall()
-        conn.close()
-
-        # Add column headers
-        headers = ["Team ID", "Player ID", "Game ID", "Points", "Created At", "Comment"]
-        for header in headers:
-            self.scores_grid.add_widget(Label(text=header, bold=True))
-
-        # Add score data
-        for score in scores:
-            for data in score:
-                self.scores_grid.add_widget(Label(text=str(data)))
+        self.scores_table.reset(lambda after_id, limit: repo.score_page(after_id=after_id, limit=limit))
 
 class CompetitionApp(App):
     def build(self):
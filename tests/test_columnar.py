@@ -0,0 +1,36 @@
+from columnar import ColumnarRows
+
+class RawCursor:
+    """Just enough of a raw mysql.connector cursor: bytes values, fetched in batches."""
+    def __init__(self, rows, column_count):
+        self.rows = list(rows)
+        self.description = [None] * column_count
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+ROWS = [
+    (b"3", b"Red", b"2024-01-01", b"1.50"),
+    (b"7", b"Blue", None, b"2.00"),
+    (b"5", b"Green", b"2024-03-01", None),
+]
+
+def test_fetch_reads_every_batch():
+    rows = ColumnarRows.fetch(RawCursor(ROWS, 4), batch_size=2)
+    assert len(rows) == 3
+    assert list(rows.ids) == [3, 7, 5]
+    assert rows.high_water() == 7
+
+def test_values_decode_on_demand():
+    rows = ColumnarRows.fetch(RawCursor(ROWS, 4))
+    assert rows.values(0) == ("3", "Red", "2024-01-01", "1.50")
+    assert rows.values(1) == ("7", "Blue", None, "2.00")  # NULL stays None
+    assert rows.values(2, {3: lambda value: "-" if value is None else value.decode()}) == (
+        "5", "Green", "2024-03-01", "-"
+    )
+
+def test_empty_result():
+    rows = ColumnarRows.fetch(RawCursor([], 2))
+    assert len(rows) == 0
+    assert rows.high_water() is None
@@ -0,0 +1,55 @@
+from dashboard import CompetitionFigures, DashboardCache
+
+def counts(teams=2, players=6, games=3):
+    return (teams, players, games)
+
+def test_merge_adds_new_scores_to_the_totals():
+    figures = CompetitionFigures()
+    figures.merge([counts() + (10, "Darts", 2, 15, 4), counts() + (11, "Chess", 1, 5, 3)])
+    figures.merge([counts(players=7) + (10, "Darts", 1, 10, 9)])
+    assert figures.per_game == {10: ["Darts", 3, 25], 11: ["Chess", 1, 5]}
+    assert figures.last_score_id == 9
+    assert figures.summary() == {
+        "teams": 2, "players": 7, "games": 3, "games_played": 2,
+        "scores": 4, "points": 30, "points_per_game": 15,
+    }
+
+def test_merge_without_new_scores_only_takes_the_counts():
+    figures = CompetitionFigures()
+    figures.merge([counts(teams=4) + (None,) * 5])
+    assert figures.summary()["teams"] == 4
+    assert figures.summary()["games_played"] == 0
+    assert figures.last_score_id == 0
+
+class Loads:
+    """A load(competition_id, since_id) that returns queued results and records its calls."""
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def __call__(self, competition_id, since_id):
+        self.calls.append((competition_id, since_id))
+        return self.results.pop(0)
+
+def test_cache_only_loads_scores_past_the_last_seen():
+    load = Loads([counts() + (10, "Darts", 2, 15, 4)], [counts() + (10, "Darts", 1, 5, 6)], [counts() + (None,) * 5])
+    cache = DashboardCache(load)
+    assert cache.get(1)["points"] == 15
+    assert cache.get(1)["points"] == 20
+    assert cache.get(1)["scores"] == 3
+    assert load.calls == [(1, 0), (1, 4), (1, 6)]
+
+def test_invalidate_recomputes_from_scratch():
+    load = Loads([counts() + (10, "Darts", 2, 15, 4)], [counts() + (10, "Darts", 1, 5, 4)])
+    cache = DashboardCache(load)
+    cache.get(1)
+    cache.invalidate(1)
+    assert cache.get(1)["points"] == 5
+    assert load.calls == [(1, 0), (1, 0)]
+
+def test_stale_entries_are_rebuilt():
+    load = Loads([counts() + (10, "Darts", 2, 15, 4)], [counts() + (10, "Darts", 2, 15, 4)])
+    cache = DashboardCache(load, max_age=-1)
+    cache.get(1)
+    assert cache.get(1)["points"] == 15
+    assert load.calls == [(1, 0), (1, 0)]
@@ -0,0 +1,35 @@
+import io
+import json
+import pytest
+from importer import iter_json_array
+
+def elements(text, block_size=4):
+    return list(iter_json_array(io.StringIO(text), block_size=block_size))
+
+@pytest.mark.parametrize("text", [
+    "[]",
+    " [ ] ",
+    '[{"name": "Team A", "competition": 1}, {"name": "Team B", "competition": 1}]',
+    '[1.5e10, -0.25, 12345678, true, false, null, "a, ] b", [1, [2]], {"a": {"b": []}}]',
+    '\n[\n  {"points": 10},\n  {"points": 2.5}\n]\n',
+])
+@pytest.mark.parametrize("block_size", [1, 2, 3, 4, 7, 65536])
+def test_matches_json_loads_at_any_block_size(text, block_size):
+    assert elements(text, block_size) == json.loads(text)
+
+def test_number_split_across_blocks():
+    # "[1." then "5e10": raw_decode reads "1" from the first block alone
+    assert elements("[1.5e10]", block_size=3) == [1.5e10]
+    assert elements("[1e-5, 2]", block_size=3) == [1e-5, 2]
+
+def test_elements_before_an_error_are_yielded():
+    found = []
+    with pytest.raises(ValueError):
+        for value in iter_json_array(io.StringIO('[{"a": 1}, {"a": 2} {"a": 3}]'), block_size=5):
+            found.append(value)
+    assert found == [{"a": 1}, {"a": 2}]
+
+@pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", "[1,, 2]", "[1 2]", "[1.]", "[tru]", ""])
+def test_rejects_anything_but_an_array(text):
+    with pytest.raises(ValueError):
+        elements(text)
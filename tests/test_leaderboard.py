@@ -0,0 +1,40 @@
+from leaderboard import rank_rows
+
+def test_pivots_and_ranks_teams():
+    rows = [
+        (1, "Red", 10, "Darts", "2024-02-01", 5),
+        (1, "Red", 11, "Chess", "2024-01-01", 3),
+        (2, "Blue", 10, "Darts", "2024-02-01", 8),
+        (1, "Red", 10, "Darts", "2024-02-01", 2),  # Players' points for the same game add up
+    ]
+    games, ranked = rank_rows(rows)
+    assert games == ["Chess", "Darts"]  # By date played
+    assert ranked == [(1, "Red", 10, 3, 7), (2, "Blue", 8, 0, 8)]
+
+def test_ties_share_a_rank():
+    rows = [
+        (1, "A", 10, "Darts", None, 5),
+        (2, "B", 10, "Darts", None, 5),
+        (3, "C", 10, "Darts", None, 1),
+    ]
+    _, ranked = rank_rows(rows)
+    assert [(rank, name) for rank, name, *_ in ranked] == [(1, "A"), (1, "B"), (3, "C")]
+
+def test_teams_without_scores_rank_last_with_zeros():
+    rows = [
+        (1, "Red", 10, "Darts", "2024-01-01", 4),
+        (2, "Blue", None, None, None, None),
+    ]
+    games, ranked = rank_rows(rows)
+    assert games == ["Darts"]
+    assert ranked == [(1, "Red", 4, 4), (2, "Blue", 0, 0)]
+
+def test_undated_games_come_last():
+    rows = [
+        (1, "Red", 10, "Later", None, 1),
+        (1, "Red", 11, "Dated", "2024-01-01", 1),
+    ]
+    assert rank_rows(rows)[0] == ["Dated", "Later"]
+
+def test_no_teams():
+    assert rank_rows([]) == ([], [])
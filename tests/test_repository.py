@@ -0,0 +1,25 @@
+from repository import prefix_condition, search_condition
+
+def test_prefix_condition_escapes_wildcards():
+    assert prefix_condition("name", "50%_a\\b") == ("name LIKE %s", ["50\\%\\_a\\\\b%"])
+
+def test_first_word_is_an_indexed_prefix_and_the_rest_a_residual_regexp():
+    assert search_condition("teams.name", "jo smi") == (
+        "(teams.name LIKE %s AND teams.name REGEXP %s)", ["jo%", "(^|[^[:alnum:]_])smi"]
+    )
+
+def test_fulltext_answers_indexed_words():
+    sql, params = search_condition("name", "john smith", fulltext=True)
+    assert sql == "(MATCH(name) AGAINST (%s IN BOOLEAN MODE))"
+    assert params == ["+john* +smith*"]
+
+def test_short_words_and_stopwords_are_residual_with_fulltext():
+    sql, params = search_condition("name", "the jo smith", fulltext=True)
+    assert sql == "(MATCH(name) AGAINST (%s IN BOOLEAN MODE) AND name REGEXP %s AND name REGEXP %s)"
+    assert params == ["+smith*", "(^|[^[:alnum:]_])the", "(^|[^[:alnum:]_])jo"]
+
+def test_fulltext_without_indexed_words_falls_back_to_a_prefix():
+    assert search_condition("name", "jo", fulltext=True) == ("(name LIKE %s)", ["jo%"])
+
+def test_term_without_words_is_a_plain_prefix():
+    assert search_condition("name", "#") == ("name LIKE %s", ["#%"])
@@ -0,0 +1,8 @@
+from schema import MIGRATIONS, current_version, migrate, verify_plans
+
+def test_migrations_reach_the_latest_version(scratch_connection):
+    assert current_version(scratch_connection.cursor()) == MIGRATIONS[-1][0]
+    assert migrate(scratch_connection) == []  # Already up to date
+
+def test_hot_queries_use_indexes(scratch_connection):
+    assert verify_plans(scratch_connection) == []
@@ -0,0 +1,131 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import mysql.connector
+
+QUEUE_PATH = "pending_writes.sqlite3"
+REPLAY_BATCH = 200  # Queued writes sent per transaction
+# Client error codes meaning the server could not be reached, as opposed to a refused statement
+CONNECTION_ERRNOS = {2002, 2003, 2005, 2006, 2013, 2055}
+
+def new_key():
+    """A fresh idempotency key, given to a write before its first attempt."""
+    return uuid.uuid4().hex
+
+def is_connection_error(error):
+    """True if a mysql.connector error means the database is unreachable (the write can be retried later)."""
+    return getattr(error, "errno", None) in CONNECTION_ERRNOS
+
+class WriteQueue:
+    """Durable local queue (a SQLite file) for writes made while the database is unreachable.
+
+    Each write is stored as a kind ("team", "player" or "score"), its parameters
+    and a random idempotency key. replay() sends them to MySQL in batches; the
+    key is recorded server-side in the same transaction, so a write is applied
+    once even if the desk crashes between the commit and removing it here.
+    Writes the server refuses (e.g. the game was deleted meanwhile) are kept
+    and marked failed instead of blocking the rest of the queue.
+    """
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)  # Autocommit
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pending (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                error TEXT
+            )
+        """)
+
+    def enqueue(self, kind, params, key=None):
+        """Durably store one write; returns its idempotency key.
+
+        Pass the key the write was first attempted with: if that attempt did
+        commit before the connection dropped, replaying it is then a no-op.
+        """
+        key = key or new_key()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO pending (idempotency_key, kind, params, created_at) VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(list(params)), time.time())
+            )
+        return key
+
+    def counts(self):
+        """(writes waiting to be sent, writes the server refused)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COALESCE(SUM(error IS NULL), 0), COALESCE(SUM(error IS NOT NULL), 0) FROM pending"
+            ).fetchone()
+        return row[0], row[1]
+
+    def next_batch(self, size=REPLAY_BATCH):
+        """The oldest waiting writes as (row id, key, kind, params)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, idempotency_key, kind, params FROM pending WHERE error IS NULL ORDER BY id LIMIT ?",
+                (size,)
+            ).fetchall()
+        return [(row_id, key, kind, json.loads(params)) for row_id, key, kind, params in rows]
+
+    def remove(self, row_ids):
+        with self._lock:
+            self._db.executemany("DELETE FROM pending WHERE id = ?", [(row_id,) for row_id in row_ids])
+
+    def mark_failed(self, row_id, error):
+        with self._lock:
+            self._db.execute("UPDATE pending SET error = ? WHERE id = ?", (str(error), row_id))
+
+    def failed(self):
+        """(kind, params, error) for every write the server refused."""
+        with self._lock:
+            rows = self._db.execute("SELECT kind, params, error FROM pending WHERE error IS NOT NULL ORDER BY id").fetchall()
+        return [(kind, json.loads(params), error) for kind, params, error in rows]
+
+    def retry_failed(self):
+        """Put refused writes back in line (e.g. after the missing team was re-created)."""
+        with self._lock:
+            self._db.execute("UPDATE pending SET error = NULL WHERE error IS NOT NULL")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def replay(write_queue, repo, batch_size=REPLAY_BATCH):
+    """Send every waiting write through repo.apply_queued in batched transactions.
+
+    Returns ({kind: writes applied}, number refused). Raises the error if the
+    database is still unreachable; whatever was not committed stays queued.
+    """
+    applied, refused = {}, 0
+
+    def send(rows):
+        for kind, count in repo.apply_queued([(key, kind, params) for _, key, kind, params in rows]).items():
+            applied[kind] = applied.get(kind, 0) + count
+        write_queue.remove([row[0] for row in rows])
+
+    while True:
+        batch = write_queue.next_batch(batch_size)
+        if not batch:
+            return applied, refused
+        try:
+            send(batch)
+        except mysql.connector.Error as e:
+            if is_connection_error(e):
+                raise
+            # Something in the batch was refused; isolate it so the rest still goes in
+            for row in batch:
+                try:
+                    send([row])
+                except mysql.connector.Error as e:
+                    if is_connection_error(e):
+                        raise
+                    write_queue.mark_failed(row[0], e)
+                    refused += 1